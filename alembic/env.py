@@ -2,6 +2,7 @@ from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy.engine import make_url
 
 from alembic import context
 import os
@@ -65,10 +66,20 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    engine_options = {}
+    if make_url(DATABASE_URL).drivername in ("postgresql", "postgresql+psycopg2"):
+        # Send executemany() batches (e.g. op.bulk_insert) as paged
+        # multi-row statements instead of one round trip per row
+        engine_options.update(
+            executemany_mode="values_plus_batch",
+            insertmanyvalues_page_size=1000,
+        )
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
+        **engine_options,
     )
 
     with connectable.connect() as connection:
@@ -16,6 +16,28 @@ down_revision: str = 'update_risk_compliance_mapping'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+# (index name, column) pairs built on employee_trainings
+INDEXES = [
+    ('ix_employee_trainings_employee_email', 'employee_email'),
+    ('ix_employee_trainings_manager_email', 'manager_email'),
+    ('ix_employee_trainings_due_date', 'due_date'),
+    ('ix_employee_trainings_status', 'status'),
+]
+
+def _drop_invalid_index(index_name: str) -> None:
+    """Drop a leftover invalid index from a failed concurrent build."""
+    bind = op.get_bind()
+    invalid = bind.execute(
+        sa.text("""
+            SELECT 1 FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :name AND NOT i.indisvalid
+        """),
+        {"name": index_name}
+    ).scalar()
+    if invalid:
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+
 def upgrade() -> None:
     # Create TrainingStatus enum
     op.execute("""
@@ -40,34 +62,21 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint('id')
     )
     
-    # Create indexes
-    op.create_index(
-        'ix_employee_trainings_employee_email',
-        'employee_trainings',
-        ['employee_email']
-    )
-    op.create_index(
-        'ix_employee_trainings_manager_email',
-        'employee_trainings',
-        ['manager_email']
-    )
-    op.create_index(
-        'ix_employee_trainings_due_date',
-        'employee_trainings',
-        ['due_date']
-    )
-    op.create_index(
-        'ix_employee_trainings_status',
-        'employee_trainings',
-        ['status']
-    )
+    # Create indexes concurrently so employee_trainings stays writable.
+    # CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for index_name, column in INDEXES:
+            _drop_invalid_index(index_name)
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+                f"ON employee_trainings ({column})"
+            )
 
 def downgrade() -> None:
     # Drop indexes
-    op.drop_index('ix_employee_trainings_status')
-    op.drop_index('ix_employee_trainings_due_date')
-    op.drop_index('ix_employee_trainings_manager_email')
-    op.drop_index('ix_employee_trainings_employee_email')
+    with op.get_context().autocommit_block():
+        for index_name, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
     
     # Drop table
     op.drop_table('employee_trainings')
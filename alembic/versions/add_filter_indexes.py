@@ -0,0 +1,54 @@
+"""Add composite indexes for alert, regulation and training filters
+
+Revision ID: add_filter_indexes
+Revises: add_jurisdiction_code_index
+Create Date: 2025-03-11 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_filter_indexes'
+down_revision: str = 'add_jurisdiction_code_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns); equality columns first, range/order columns last
+INDEXES = [
+    ('ix_alerts_reg_due', 'compliance_alerts', 'regulation_id, due_date'),
+    ('ix_compliance_alerts_due_date', 'compliance_alerts', 'due_date'),
+    ('ix_regulation_agency_impact', 'regulations', 'agency_id, impact_level'),
+    ('ix_training_status_due', 'employee_trainings', 'status, due_date'),
+]
+
+def _drop_invalid_index(index_name: str) -> None:
+    """Drop a leftover invalid index from a failed concurrent build."""
+    bind = op.get_bind()
+    invalid = bind.execute(
+        sa.text("""
+            SELECT 1 FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :name AND NOT i.indisvalid
+        """),
+        {"name": index_name}
+    ).scalar()
+    if invalid:
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for index_name, table_name, columns in INDEXES:
+            _drop_invalid_index(index_name)
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+                f"ON {table_name} ({columns})"
+            )
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, _, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
@@ -0,0 +1,39 @@
+"""Index jurisdictions.code
+
+Revision ID: add_jurisdiction_code_index
+Revises: add_employee_training
+Create Date: 2025-03-10 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_jurisdiction_code_index'
+down_revision: str = 'add_employee_training'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'ix_jurisdictions_code'
+
+def upgrade() -> None:
+    # Build concurrently so jurisdictions stays writable.
+    # CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        invalid = op.get_bind().execute(
+            sa.text("""
+                SELECT 1 FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = :name AND NOT i.indisvalid
+            """),
+            {"name": INDEX_NAME}
+        ).scalar()
+        if invalid:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
+        op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} ON jurisdictions (code)")
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
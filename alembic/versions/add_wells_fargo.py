@@ -17,10 +17,11 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
-    # Create Wells Fargo bank with fixed ID
+    # Create Wells Fargo bank with fixed ID; a no-op if it already exists
     op.execute("""
         INSERT INTO banks (id, name, size_category)
         VALUES ('bank-001', 'Wells Fargo', 'Global Systemically Important')
+        ON CONFLICT DO NOTHING
     """)
 
 def downgrade() -> None:
@@ -0,0 +1,97 @@
+"""Store enum columns as VARCHAR holding the enum value
+
+Revision ID: enum_columns_to_varchar
+Revises: add_filter_indexes
+Create Date: 2025-03-11 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'enum_columns_to_varchar'
+down_revision: str = 'add_filter_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Member name -> value for each enum. Tables created by create_all stored the names,
+# the tables created here stored the values; both end up holding the values.
+JURISDICTION_TYPES = {
+    'GLOBAL': 'Global', 'REGIONAL': 'Regional', 'NATIONAL': 'National',
+    'STATE': 'State/Province', 'LOCAL': 'Local',
+}
+UNIT_CATEGORIES = {
+    'APPLICATION': 'Application', 'INFRASTRUCTURE': 'Infrastructure', 'SECURITY': 'Security',
+    'GOVERNANCE': 'Governance', 'OPERATIONS': 'Operations',
+}
+IMPACT_LEVELS = {'HIGH': 'High', 'MEDIUM': 'Medium', 'LOW': 'Low'}
+REGULATION_CATEGORIES = {
+    'RISK': 'Risk Management', 'CAPITAL': 'Capital & Liquidity',
+    'CONSUMER_PROTECTION': 'Consumer Protection', 'FINANCIAL': 'Financial Regulation',
+    'FRAUD': 'Fraud Prevention', 'DATA_PRIVACY': 'Data Privacy', 'AML': 'Anti-Money Laundering',
+    'REPORTING': 'Financial Reporting', 'GOVERNANCE': 'Corporate Governance',
+    'MARKET_CONDUCT': 'Market Conduct', 'CYBERSECURITY': 'Cybersecurity',
+    'OPERATIONAL': 'Operational Risk', 'OTHER': 'Other',
+}
+TRAINING_STATUSES = {'PENDING': 'Pending', 'IN_PROGRESS': 'In Progress', 'COMPLETED': 'Completed'}
+ENTITY_TYPES = {
+    'CORPORATION': 'Corporation', 'NON_PROFIT': 'Non-Profit', 'SHELL_COMPANY': 'Shell Company',
+    'FINANCIAL_INTERMEDIARY': 'Financial Intermediary', 'INDIVIDUAL': 'Individual', 'OTHER': 'Other',
+}
+SOURCE_TYPES = {
+    'TRANSACTION_DATA': 'Transaction Data', 'PUBLIC_RECORDS': 'Public Records',
+    'NEWS_ARTICLES': 'News Articles', 'REGULATORY_FILINGS': 'Regulatory Filings',
+    'COURT_RECORDS': 'Court Records', 'SANCTIONS_LISTS': 'Sanctions Lists',
+    'CORPORATE_REGISTRIES': 'Corporate Registries', 'FINANCIAL_STATEMENTS': 'Financial Statements',
+    'OTHER': 'Other',
+}
+VERIFICATION_STATUSES = {
+    'PENDING': 'Pending', 'VERIFIED': 'Verified', 'DISPUTED': 'Disputed',
+    'INCONCLUSIVE': 'Inconclusive',
+}
+
+# (table, column, enum type name, members)
+ENUM_COLUMNS = [
+    ('jurisdictions', 'type', 'jurisdictiontype', JURISDICTION_TYPES),
+    ('risk_assessment_units', 'category', 'unitcategory', UNIT_CATEGORIES),
+    ('regulations', 'impact_level', 'impactlevel', IMPACT_LEVELS),
+    ('regulation_categories', 'category', 'regulationcategory', REGULATION_CATEGORIES),
+    ('compliance_alerts', 'priority', 'impactlevel', IMPACT_LEVELS),
+    ('employee_trainings', 'status', 'trainingstatus', TRAINING_STATUSES),
+    ('entities', 'type', 'entitytype', ENTITY_TYPES),
+    ('entities', 'analysis_status', 'verificationstatus', VERIFICATION_STATUSES),
+    ('entity_sources', 'source_type', 'sourcetype', SOURCE_TYPES),
+    ('entity_sources', 'verification_status', 'verificationstatus', VERIFICATION_STATUSES),
+]
+
+def upgrade() -> None:
+    # The entity tables only exist where create_all has run
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    columns = [entry for entry in ENUM_COLUMNS if entry[0] in tables]
+
+    for table_name, column, _, members in columns:
+        op.execute(f"ALTER TABLE {table_name} ALTER COLUMN {column} TYPE VARCHAR(32) USING {column}::text")
+        for name, value in members.items():
+            op.execute(
+                sa.text(f"UPDATE {table_name} SET {column} = :value WHERE {column} = :name")
+                .bindparams(value=value, name=name)
+            )
+
+    for type_name in dict.fromkeys(entry[2] for entry in ENUM_COLUMNS):
+        op.execute(f"DROP TYPE IF EXISTS {type_name}")
+
+def downgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    for type_name, members in dict((entry[2], entry[3]) for entry in ENUM_COLUMNS).items():
+        labels = ", ".join(f"'{value}'" for value in members.values())
+        op.execute(f"CREATE TYPE {type_name} AS ENUM ({labels})")
+
+    for table_name, column, type_name, _ in ENUM_COLUMNS:
+        if table_name in tables:
+            op.execute(
+                f"ALTER TABLE {table_name} ALTER COLUMN {column} "
+                f"TYPE {type_name} USING {column}::{type_name}"
+            )
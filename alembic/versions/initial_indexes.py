@@ -0,0 +1,72 @@
+"""Add indexes on foreign key columns
+
+Revision ID: initial_indexes
+Revises: enum_columns_to_varchar
+Create Date: 2025-03-11 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'initial_indexes'
+down_revision: str = 'enum_columns_to_varchar'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, column) for the foreign key columns created in
+# initial_migration, whose primary key and unique constraints already back
+# the foreign key targets. This revision sits at the head of the chain so
+# databases that are already migrated get the indexes too; IF NOT EXISTS
+# makes it safe where they exist.
+INDEXES = [
+    ('ix_jurisdictions_parent_id', 'jurisdictions', 'parent_id'),
+    ('ix_agencies_jurisdiction_id', 'agencies', 'jurisdiction_id'),
+    ('ix_banks_jurisdiction_id', 'banks', 'jurisdiction_id'),
+    ('ix_regulations_agency_id', 'regulations', 'agency_id'),
+    ('ix_regulations_jurisdiction_id', 'regulations', 'jurisdiction_id'),
+    ('ix_regulation_categories_regulation_id', 'regulation_categories', 'regulation_id'),
+    ('ix_compliance_steps_regulation_id', 'compliance_steps', 'regulation_id'),
+    ('ix_bank_regulation_regulation_id', 'bank_regulation', 'regulation_id'),
+    ('ix_regulation_unit_unit_id', 'regulation_unit', 'unit_id'),
+    ('ix_related_regulations_related_regulation_id', 'related_regulations', 'related_regulation_id'),
+    ('ix_compliance_alerts_regulation_id', 'compliance_alerts', 'regulation_id'),
+    ('ix_regulatory_updates_regulation_id', 'regulatory_updates', 'regulation_id'),
+    ('ix_chat_messages_user_id', 'chat_messages', 'user_id'),
+    ('ix_citations_message_id', 'citations', 'message_id'),
+    ('ix_citations_regulation_id', 'citations', 'regulation_id'),
+    ('ix_documents_regulation_id', 'documents', 'regulation_id'),
+    ('ix_documents_jurisdiction_id', 'documents', 'jurisdiction_id'),
+    ('ix_documents_user_id', 'documents', 'user_id'),
+]
+
+def _drop_invalid_index(index_name: str) -> None:
+    """Drop a leftover invalid index from a failed concurrent build."""
+    bind = op.get_bind()
+    invalid = bind.execute(
+        sa.text("""
+            SELECT 1 FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :name AND NOT i.indisvalid
+        """),
+        {"name": index_name}
+    ).scalar()
+    if invalid:
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for index_name, table_name, column in INDEXES:
+            _drop_invalid_index(index_name)
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+                f"ON {table_name} ({column})"
+            )
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, _, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
@@ -9,6 +9,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert
 
 # revision identifiers, used by Alembic.
 revision: str = 'update_risk_compliance'
@@ -16,24 +17,63 @@ down_revision: str = 'add_wells_fargo'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+risk_assessment_units = sa.table(
+    'risk_assessment_units',
+    sa.column('id', sa.String),
+    sa.column('name', sa.String),
+    sa.column('description', sa.Text),
+    sa.column('category', sa.String),
+    sa.column('created_at', sa.DateTime),
+    sa.column('updated_at', sa.DateTime)
+)
+
+regulation_unit = sa.table(
+    'regulation_unit',
+    sa.column('regulation_id', sa.String),
+    sa.column('unit_id', sa.String)
+)
+
+# (id, name, description, category)
+UNITS = [
+    ('unit-001', 'Enterprise Risk Management', 'Manages enterprise-wide risk assessment and mitigation', 'Governance'),
+    ('unit-002', 'Cyber Security Governance', 'Oversees cybersecurity policies and controls', 'Security')
+]
+
+# Map Basel III to Enterprise Risk Management and Cyber Security Governance
+MAPPINGS = [
+    ('REG-001', 'unit-001'),
+    ('REG-001', 'unit-002')
+]
+
 def upgrade() -> None:
-    # Add risk assessment units with fixed IDs
-    op.execute("""
-        INSERT INTO risk_assessment_units (id, name, description, category, created_at, updated_at)
-        VALUES 
-            ('unit-001', 'Enterprise Risk Management', 'Manages enterprise-wide risk assessment and mitigation', 'Governance', NOW(), NOW()),
-            ('unit-002', 'Cyber Security Governance', 'Oversees cybersecurity policies and controls', 'Security', NOW(), NOW())
-        ON CONFLICT (name) DO NOTHING
-    """)
+    # Add risk assessment units with fixed IDs in a single multi-row INSERT,
+    # skipping rows whose id or name already exists
+    now = sa.func.now()
+    op.execute(
+        insert(risk_assessment_units)
+        .values([
+            {
+                'id': unit_id,
+                'name': name,
+                'description': description,
+                'category': category,
+                'created_at': now,
+                'updated_at': now
+            }
+            for unit_id, name, description, category in UNITS
+        ])
+        .on_conflict_do_nothing()
+    )
     
     # Map regulations to risk assessment units
-    op.execute("""
-        INSERT INTO regulation_unit (regulation_id, unit_id)
-        VALUES 
-            ('REG-001', 'unit-001'),  -- Map Basel III to Enterprise Risk Management
-            ('REG-001', 'unit-002')   -- Map Basel III to Cyber Security Governance
-        ON CONFLICT DO NOTHING
-    """)
+    op.execute(
+        insert(regulation_unit)
+        .values([
+            {'regulation_id': regulation_id, 'unit_id': unit_id}
+            for regulation_id, unit_id in MAPPINGS
+        ])
+        .on_conflict_do_nothing()
+    )
 
 def downgrade() -> None:
     # Remove regulation-unit mappings
@@ -9,6 +9,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert
 
 # revision identifiers, used by Alembic.
 revision: str = 'update_risk_compliance_mapping'
@@ -16,19 +17,54 @@ down_revision: str = 'update_risk_compliance'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+risk_assessment_units = sa.table(
+    'risk_assessment_units',
+    sa.column('id', sa.String),
+    sa.column('name', sa.String),
+    sa.column('description', sa.Text),
+    sa.column('category', sa.String),
+    sa.column('created_at', sa.DateTime),
+    sa.column('updated_at', sa.DateTime)
+)
+
+regulation_categories = sa.table(
+    'regulation_categories',
+    sa.column('id', sa.String),
+    sa.column('regulation_id', sa.String),
+    sa.column('category', sa.String)
+)
+
+# (id, name, description, category)
+UNITS = [
+    ('unit-003', 'Enterprise Risk Management', 'Manages enterprise-wide risk assessment and mitigation', 'Governance'),
+    ('unit-004', 'Cyber Security Governance', 'Oversees cybersecurity policies and controls', 'Security'),
+    ('unit-005', 'Regulatory Change Management', 'Manages regulatory compliance changes', 'Governance'),
+    ('unit-006', 'Information Security', 'Ensures data and system security', 'Security'),
+    ('unit-007', 'Compliance Monitoring', 'Monitors ongoing compliance with regulations', 'Governance'),
+    ('unit-008', 'Risk Assessment', 'Conducts risk assessments and analysis', 'Governance')
+]
+
+CATEGORIES = ['Risk Management', 'Capital & Liquidity', 'Cybersecurity']
+
 def upgrade() -> None:
-    # Add additional risk assessment units with fixed IDs
-    op.execute("""
-        INSERT INTO risk_assessment_units (id, name, description, category, created_at, updated_at)
-        VALUES 
-            ('unit-003', 'Enterprise Risk Management', 'Manages enterprise-wide risk assessment and mitigation', 'Governance', NOW(), NOW()),
-            ('unit-004', 'Cyber Security Governance', 'Oversees cybersecurity policies and controls', 'Security', NOW(), NOW()),
-            ('unit-005', 'Regulatory Change Management', 'Manages regulatory compliance changes', 'Governance', NOW(), NOW()),
-            ('unit-006', 'Information Security', 'Ensures data and system security', 'Security', NOW(), NOW()),
-            ('unit-007', 'Compliance Monitoring', 'Monitors ongoing compliance with regulations', 'Governance', NOW(), NOW()),
-            ('unit-008', 'Risk Assessment', 'Conducts risk assessments and analysis', 'Governance', NOW(), NOW())
-        ON CONFLICT (name) DO NOTHING
-    """)
+    # Add additional risk assessment units with fixed IDs in a single multi-row INSERT,
+    # skipping rows whose id or name already exists
+    now = sa.func.now()
+    op.execute(
+        insert(risk_assessment_units)
+        .values([
+            {
+                'id': unit_id,
+                'name': name,
+                'description': description,
+                'category': category,
+                'created_at': now,
+                'updated_at': now
+            }
+            for unit_id, name, description, category in UNITS
+        ])
+        .on_conflict_do_nothing()
+    )
     
     # Map regulations to risk assessment units
     op.execute("""
@@ -47,14 +83,14 @@ def upgrade() -> None:
     """)
     
     # Add categories for regulations
-    op.execute("""
-        INSERT INTO regulation_categories (id, regulation_id, category)
-        VALUES 
-            (gen_random_uuid(), 'REG-001', 'Risk Management'),
-            (gen_random_uuid(), 'REG-001', 'Capital & Liquidity'),
-            (gen_random_uuid(), 'REG-001', 'Cybersecurity')
-        ON CONFLICT DO NOTHING
-    """)
+    op.execute(
+        insert(regulation_categories)
+        .values([
+            {'id': sa.func.gen_random_uuid(), 'regulation_id': 'REG-001', 'category': category}
+            for category in CATEGORIES
+        ])
+        .on_conflict_do_nothing()
+    )
 
 def downgrade() -> None:
     # Remove regulation-unit mappings for new units
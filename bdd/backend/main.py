@@ -1,99 +1,135 @@
-from fastapi import FastAPI, UploadFile, HTTPException
+from fastapi import FastAPI, UploadFile, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Dict, List, Optional
-import json
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+import orjson
 import yaml
 from pathlib import Path
 import uvicorn
 
-app = FastAPI(title="Karate BDD Automation Generator")
+app = FastAPI(
+    title="Karate BDD Automation Generator",
+    default_response_class=ORJSONResponse
+)
 
 # CORS middleware configuration
+origins = [
+    "http://localhost:5173",  # Vite dev server
+    "http://localhost:4173",  # Vite preview
+    "http://localhost:3000",
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
+    allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
+# Largest OpenAPI specification accepted by /parse-openapi
+MAX_SPEC_BYTES = 10 * 1024 * 1024
+
+# libyaml bindings when available, pure-Python loader otherwise
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+_ALLOWED_METHODS = frozenset({'get', 'post', 'put', 'delete', 'patch'})
+
+# The mock /generate body never changes, so encode it once
+_MOCK_LLM_RESPONSE = orjson.dumps({
+    "response": "Generated test cases based on JIRA story and API specification.",
+    "status": "success"
+})
+
+# Request models are immutable and drop unknown keys
+_REQUEST_MODEL_CONFIG = ConfigDict(frozen=True, extra='ignore')
+
 class Message(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     role: str
     content: str
 
 class LLMRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     messages: List[Message]
     max_new_tokens: int = 200
     temperature: float = 0.7
 
 class EndpointConfig(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     jiraStory: str
     requestData: str
     responseData: str
     selected: bool
 
 class GenerateTestRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     endpoints: Dict[str, EndpointConfig]
-    openApiSpec: dict
+    openApiSpec: Dict[str, Any] = Field(default_factory=dict)
 
 @app.post("/parse-openapi")
 async def parse_openapi(file: UploadFile):
+    # Reject oversized uploads before reading them
+    if file.size is not None and file.size > MAX_SPEC_BYTES:
+        raise HTTPException(status_code=413, detail=f"OpenAPI specification exceeds {MAX_SPEC_BYTES} bytes")
+    
+    # Sniff the leading bytes: JSON documents open with an object or array,
+    # anything else goes to the YAML loader
+    head = file.file.read(64)
+    file.file.seek(0)
+    
     try:
-        content = await file.read()
-        if file.filename.endswith(('.yaml', '.yml')):
-            spec = yaml.safe_load(content)
+        if head.lstrip().startswith((b'{', b'[')):
+            spec = orjson.loads(await file.read())
         else:
-            spec = json.loads(content)
-        
-        # Validate the OpenAPI spec structure
-        if 'paths' not in spec:
-            raise HTTPException(status_code=400, detail="Invalid OpenAPI specification: 'paths' field is required")
-        
-        return {"spec": spec}
-    except Exception as e:
+            # Let the YAML reader pull from the spooled upload incrementally
+            spec = yaml.load(file.file, Loader=_YAML_LOADER)
+    except (orjson.JSONDecodeError, yaml.YAMLError) as e:
         raise HTTPException(status_code=400, detail=str(e))
+    
+    # Validate the OpenAPI spec structure
+    if not isinstance(spec, dict) or 'paths' not in spec:
+        raise HTTPException(status_code=400, detail="Invalid OpenAPI specification: 'paths' field is required")
+    
+    return {"spec": spec}
 
 @app.post("/generate-tests")
 async def generate_tests(request: GenerateTestRequest):
     try:
-        # Filter selected endpoints
-        selected_endpoints = {
-            path: config for path, config in request.endpoints.items()
+        # Generate test cases for each selected endpoint in a single pass
+        spec_paths = request.openApiSpec['paths']
+        test_cases = {
+            path: generate_karate_test(path, spec_paths[path], config)
+            for path, config in request.endpoints.items()
             if config.selected
         }
         
-        # Generate test cases for each selected endpoint
-        test_cases = {}
-        for path, config in selected_endpoints.items():
-            test_cases[path] = generate_karate_test(
-                path,
-                request.openApiSpec['paths'][path],
-                config
-            )
-        
         return {"testCases": test_cases}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/generate")
 async def generate_llm(request: LLMRequest):
-    try:
-        # Mock LLM response for development
-        # In production, this would call your local LLM endpoint
-        return {
-            "response": "Generated test cases based on JIRA story and API specification.",
-            "status": "success"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Mock LLM response for development
+    # In production, this would call your local LLM endpoint
+    return Response(content=_MOCK_LLM_RESPONSE, media_type="application/json")
+
+@lru_cache(maxsize=1024)
+def _extract_methods(keys: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Return the HTTP methods among a path item's keys, in spec order."""
+    return tuple(key for key in keys if key.lower() in _ALLOWED_METHODS)
 
 def generate_karate_test(path: str, path_spec: dict, config: EndpointConfig) -> str:
-    # Extract HTTP methods and their specifications
-    methods = {
-        method: spec for method, spec in path_spec.items()
-        if method.lower() in ['get', 'post', 'put', 'delete', 'patch']
-    }
+    # Extract HTTP methods; keyed on the path item's keys so endpoints
+    # sharing the same method set reuse the filtered result
+    methods = _extract_methods(tuple(path_spec))
     
     feature_template = f"""Feature: {path} API Tests
     
@@ -105,15 +141,14 @@ Background:
     
     # Generate scenarios for each HTTP method
     scenarios = []
-    for method, spec in methods.items():
-        scenario = f"""
+    for method in methods:
+        scenarios.append(f"""
 Scenario: {method.upper()} {path}
     Given path '{path}'
     And request requestData
     When method {method}
     Then status 200
-    And match response == expectedResponse"""
-        scenarios.append(scenario)
+    And match response == expectedResponse""")
     
     return feature_template + '\n'.join(scenarios)
 
@@ -121,20 +156,20 @@ Scenario: {method.upper()} {path}
 async def setup_wiremock(request: GenerateTestRequest):
     try:
         # Generate WireMock stubs for selected endpoints
-        stubs = []
-        for path, config in request.endpoints.items():
-            if config.selected:
-                stub = {
-                    "request": {
-                        "url": path,
-                        "method": "ANY"  # You might want to be more specific based on the OpenAPI spec
-                    },
-                    "response": {
-                        "status": 200,
-                        "jsonBody": json.loads(config.responseData) if config.responseData else {}
-                    }
+        stubs = [
+            {
+                "request": {
+                    "url": path,
+                    "method": "ANY"  # You might want to be more specific based on the OpenAPI spec
+                },
+                "response": {
+                    "status": 200,
+                    "jsonBody": orjson.loads(config.responseData) if config.responseData else {}
                 }
-                stubs.append(stub)
+            }
+            for path, config in request.endpoints.items()
+            if config.selected
+        ]
         
         return {"stubs": stubs}
     except Exception as e:
@@ -1,5 +1,6 @@
 import pytest
 from fastapi.testclient import TestClient
+from .. import main
 from ..main import app
 
 client = TestClient(app)
@@ -25,6 +26,38 @@ def test_parse_openapi_valid_json():
     assert response.status_code == 200
     assert "spec" in response.json()
 
+def test_parse_openapi_valid_yaml():
+    # YAML is detected from the content, not the file extension
+    yaml_content = """
+openapi: 3.0.0
+paths:
+  /test:
+    get:
+      summary: Test endpoint
+"""
+    response = client.post(
+        "/parse-openapi",
+        files={"file": ("spec.txt", yaml_content, "text/plain")}
+    )
+    assert response.status_code == 200
+    assert "/test" in response.json()["spec"]["paths"]
+
+def test_parse_openapi_malformed_json():
+    response = client.post(
+        "/parse-openapi",
+        files={"file": ("test.json", '{"paths": ', "application/json")}
+    )
+    assert response.status_code == 400
+
+def test_parse_openapi_rejects_oversized_upload(monkeypatch):
+    # Uploads larger than MAX_SPEC_BYTES are refused before parsing
+    monkeypatch.setattr(main, "MAX_SPEC_BYTES", 8)
+    response = client.post(
+        "/parse-openapi",
+        files={"file": ("test.json", '{"paths": {}}', "application/json")}
+    )
+    assert response.status_code == 413
+
 def test_generate_tests():
     # Test generating Karate BDD tests
     request_data = {
@@ -50,6 +83,14 @@ def test_generate_tests():
     assert response.status_code == 200
     assert "testCases" in response.json()
 
+def test_generate_llm():
+    request_data = {
+        "messages": [{"role": "user", "content": "TEST-123"}]
+    }
+    response = client.post("/generate", json=request_data)
+    assert response.status_code == 200
+    assert response.json()["status"] == "success"
+
 def test_setup_wiremock():
     # Test WireMock stub generation
     request_data = {
@@ -71,4 +112,32 @@ def test_setup_wiremock():
     }
     response = client.post("/setup-wiremock", json=request_data)
     assert response.status_code == 200
-    assert "stubs" in response.json()
\ No newline at end of file
+    assert "stubs" in response.json()
+
+def test_generate_tests_skips_non_method_keys():
+    # Path-level keys such as "parameters" must not become scenarios
+    request_data = {
+        "endpoints": {
+            "/test": {
+                "jiraStory": "TEST-123",
+                "requestData": "{}",
+                "responseData": "{}",
+                "selected": True
+            }
+        },
+        "openApiSpec": {
+            "paths": {
+                "/test": {
+                    "parameters": [],
+                    "get": {},
+                    "POST": {}
+                }
+            }
+        }
+    }
+    response = client.post("/generate-tests", json=request_data)
+    assert response.status_code == 200
+    feature = response.json()["testCases"]["/test"]
+    assert "Scenario: GET /test" in feature
+    assert "Scenario: POST /test" in feature
+    assert "PARAMETERS" not in feature
@@ -1,5 +1,8 @@
 import sqlite3
 import os
+import sys
+from itertools import groupby
+from operator import itemgetter
 from tabulate import tabulate
 
 def get_db_path():
@@ -12,32 +15,67 @@ def get_db_path():
         return db_url[10:]
     return 'regulatory_compliance.db'
 
+# tabulate's "grid" format spends most of its time drawing cell borders
+TABLE_FORMAT = "simple"
+
+# Each query walks every user table once via the pragma table-valued
+# functions, ordered so rows for the same table are contiguous.
+USER_TABLES = "FROM sqlite_master m {joins} WHERE m.type='table' AND m.name NOT LIKE 'sqlite_%'"
+
+TABLES_QUERY = "SELECT m.name " + USER_TABLES.format(joins="") + " ORDER BY m.rowid"
+
+COLUMNS_QUERY = (
+    "SELECT m.name, p.cid, p.name, p.type, p.\"notnull\", p.dflt_value, p.pk "
+    + USER_TABLES.format(joins="JOIN pragma_table_info(m.name) p")
+    + " ORDER BY m.rowid, p.cid"
+)
+
+FOREIGN_KEYS_QUERY = (
+    "SELECT m.name, f.id, f.seq, f.\"table\", f.\"from\", f.\"to\", f.on_update, f.on_delete, f.match "
+    + USER_TABLES.format(joins="JOIN pragma_foreign_key_list(m.name) f")
+    + " ORDER BY m.rowid, f.id, f.seq"
+)
+
+INDEXES_QUERY = (
+    "SELECT m.name, il.name, group_concat(ii.name, ', ') "
+    + USER_TABLES.format(joins="JOIN pragma_index_list(m.name) il JOIN pragma_index_info(il.name) ii")
+    + " GROUP BY m.rowid, il.name ORDER BY m.rowid, il.seq"
+)
+
+def group_by_table(rows):
+    """Group query rows on their leading table name column."""
+    return {
+        table_name: [row[1:] for row in table_rows]
+        for table_name, table_rows in groupby(rows, key=itemgetter(0))
+    }
+
 def print_schema(db_path):
     """Print the schema of all tables in the SQLite database."""
     try:
-        # Connect to the database
-        conn = sqlite3.connect(db_path)
+        # Connect to the database read-only, without implicit transactions
+        conn = sqlite3.connect(db_path, isolation_level=None)
         cursor = conn.cursor()
+        cursor.execute("PRAGMA query_only = 1")
         
-        # Get all tables
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
-        tables = cursor.fetchall()
+        # Get all tables and their columns, foreign keys and indexes
+        tables = [row[0] for row in cursor.execute(TABLES_QUERY)]
+        columns_by_table = group_by_table(cursor.execute(COLUMNS_QUERY))
+        foreign_keys_by_table = group_by_table(cursor.execute(FOREIGN_KEYS_QUERY))
+        indexes_by_table = group_by_table(cursor.execute(INDEXES_QUERY))
         
-        print(f"Database: {db_path}\n")
-        print(f"Found {len(tables)} tables:\n")
+        # Buffer the report and emit it with a single write
+        out = [
+            f"Database: {db_path}\n",
+            f"Found {len(tables)} tables:\n",
+        ]
         
-        # For each table, get its schema
-        for table in tables:
-            table_name = table[0]
-            print(f"Table: {table_name}")
-            
-            # Get table schema
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = cursor.fetchall()
+        # For each table, print its schema
+        for table_name in tables:
+            out.append(f"Table: {table_name}")
             
             # Format the column information
             column_data = []
-            for col in columns:
+            for col in columns_by_table.get(table_name, []):
                 cid, name, type_, notnull, default_value, pk = col
                 column_data.append([
                     name, 
@@ -48,38 +86,34 @@ def print_schema(db_path):
                 ])
             
             # Print table schema
-            print(tabulate(column_data, headers=["Column", "Type", "Nullable", "Default", "Key"], tablefmt="grid"))
+            out.append(tabulate(column_data, headers=["Column", "Type", "Nullable", "Default", "Key"], tablefmt=TABLE_FORMAT))
             
-            # Get foreign keys
-            cursor.execute(f"PRAGMA foreign_key_list({table_name})")
-            foreign_keys = cursor.fetchall()
+            # Print foreign keys
+            foreign_keys = foreign_keys_by_table.get(table_name)
             
             if foreign_keys:
-                print("\nForeign Keys:")
+                out.append("\nForeign Keys:")
                 fk_data = []
                 for fk in foreign_keys:
                     id_, seq, table, from_, to, on_update, on_delete, match = fk
                     fk_data.append([from_, f"→ {table}({to})", on_update, on_delete])
                 
-                print(tabulate(fk_data, headers=["Column", "References", "On Update", "On Delete"], tablefmt="grid"))
+                out.append(tabulate(fk_data, headers=["Column", "References", "On Update", "On Delete"], tablefmt=TABLE_FORMAT))
             
-            # Get indexes
-            cursor.execute(f"PRAGMA index_list({table_name})")
-            indexes = cursor.fetchall()
+            # Print indexes
+            indexes = indexes_by_table.get(table_name)
             
             if indexes:
-                print("\nIndexes:")
-                for idx in indexes:
-                    idx_name = idx[1]
-                    cursor.execute(f"PRAGMA index_info({idx_name})")
-                    idx_columns = cursor.fetchall()
-                    columns = ", ".join([col[2] for col in idx_columns])
-                    print(f"- {idx_name}: {columns}")
+                out.append("\nIndexes:")
+                for idx_name, columns in indexes:
+                    out.append(f"- {idx_name}: {columns}")
             
-            print("\n" + "-" * 80 + "\n")
+            out.append("\n" + "-" * 80 + "\n")
         
         conn.close()
         
+        sys.stdout.write("\n".join(out) + "\n")
+        
     except sqlite3.Error as e:
         print(f"SQLite error: {e}")
     except Exception as e:
@@ -0,0 +1,70 @@
+from fastapi import Request, Response
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Reference data changes on the order of hours; writes clear their namespace right away
+# in the shared Redis cache, but the in-memory cache is per worker, so with several workers
+# and no REDIS_URL the other workers serve stale responses for up to CACHE_EXPIRE_SECONDS
+CACHE_PREFIX = "reg-cache"
+CACHE_EXPIRE_SECONDS = int(os.getenv("CACHE_EXPIRE_SECONDS", "300"))
+
+# Shared across workers when set; otherwise each process keeps its own cache
+REDIS_URL = os.getenv("REDIS_URL")
+
+_redis = None
+
+def request_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: Tuple[Any, ...] = (),
+    kwargs: Optional[Dict[str, Any]] = None
+) -> str:
+    """Key cached responses by path and query string (the default key includes the DB session)."""
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    return f"{namespace}:{request.url.path}?{query}"
+
+def init_cache():
+    """Set up the response cache on Redis if REDIS_URL is configured, else in process memory."""
+    global _redis
+
+    if REDIS_URL:
+        from redis import asyncio as aioredis
+        from fastapi_cache.backends.redis import RedisBackend
+
+        _redis = aioredis.from_url(REDIS_URL)
+        backend = RedisBackend(_redis)
+        logger.info("Response cache using Redis")
+    else:
+        backend = InMemoryBackend()
+        logger.info("Response cache using process memory")
+
+    FastAPICache.init(
+        backend,
+        prefix=CACHE_PREFIX,
+        expire=CACHE_EXPIRE_SECONDS,
+        key_builder=request_key_builder
+    )
+
+async def close_cache():
+    """Close the Redis connection, if any."""
+    global _redis
+
+    if _redis is not None:
+        await _redis.close()
+        _redis = None
+
+async def invalidate(*namespaces: str):
+    """Drop every cached response in the given namespaces after a write."""
+    for namespace in namespaces:
+        try:
+            await FastAPICache.clear(namespace=namespace)
+        except Exception as e:
+            logger.error(f"Error clearing response cache namespace {namespace}: {str(e)}")
@@ -1,23 +1,91 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+import asyncio
+import logging
 import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Get database URL from environment or use SQLite as default
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./regulatory_compliance.db")
 
+# Connection pool sizing for server databases; SQLite keeps SQLAlchemy's own pool choice
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+POOL_OPTIONS = {} if DATABASE_URL.startswith("sqlite") else {
+    "pool_size": POOL_SIZE,
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": 30,
+    "pool_recycle": 3600,  # Replace connections before server-side idle timeouts close them
+}
+
 # Create SQLAlchemy engine
 engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+    DATABASE_URL,
+    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
+    query_cache_size=1200,  # Room for the updater's repeated lookups alongside the API queries
+    pool_pre_ping=True,
+    **POOL_OPTIONS
 )
 
 # Create sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers for the same database, used by request handlers on the event loop
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+def _async_database_url(url: str) -> str:
+    """Swap the URL's driver (whatever sync driver it names) for the backend's async driver."""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+# Objects stay usable after commit, since async sessions cannot lazy-load expired attributes
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+_async_engine = None
+
+def get_async_engine():
+    """
+    Create the async engine on first use.
+    
+    Deferred so that importing this module (the sync engine, seeding, alembic) never
+    depends on the async driver being installed.
+    """
+    global _async_engine
+    
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            _async_database_url(DATABASE_URL),
+            pool_pre_ping=True,
+            **POOL_OPTIONS
+        )
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+async def warm_connection_pool():
+    """Fill the async connection pool up front so the first requests skip the connect cost."""
+    async_engine = get_async_engine()
+    if not hasattr(async_engine.pool, "size"):
+        return  # Pools that do not keep connections have nothing to warm
+    
+    async def ping():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    
+    await asyncio.gather(*(ping() for _ in range(async_engine.pool.size())))
+    logger.info(f"Database connection pool warmed: {async_engine.pool.status()}")
+
 # Create base class for models
 Base = declarative_base()
 
@@ -27,4 +95,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependency to get an async database session
+async def get_async_db():
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Gunicorn settings for production deployments.
+
+Run from the repository root:
+
+    gunicorn -c server/gunicorn_conf.py server.main:app
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Uvicorn workers pick up uvloop and httptools from uvicorn[standard]
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Each worker loads its own model and llama.cpp runs its threads across the cores, so
+# one worker is the default; when raising WEB_CONCURRENCY, set LLAMA_N_THREADS to about
+# the core count divided by the number of workers
+workers = int(os.getenv("WEB_CONCURRENCY", 1))
+
+# No preload_app: the models, CUDA context, SQLite connections and Chroma client must be
+# created in each worker, after the fork
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = None
+errorlog = "-"
+
+def pre_fork(server, worker):
+    """Pick a single worker to run the regulatory monitor (runs in the master)."""
+    worker.runs_monitor = not any(
+        getattr(w, "runs_monitor", False) for w in server.WORKERS.values()
+    )
+
+def post_fork(server, worker):
+    """Tell the app whether this worker owns the regulatory monitor."""
+    os.environ["REGULATORY_MONITOR_ENABLED"] = "1" if worker.runs_monitor else "0"
@@ -1,40 +1,76 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import lru_cache
 from typing import Optional, Literal
-import os
 
 class LLMSettings(BaseSettings):
+    # Read once per process and never mutated; the schema is built on first use
+    model_config = SettingsConfigDict(
+        frozen=True,
+        defer_build=True,
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        extra="ignore"
+    )
+    
     # LLM Provider Configuration
-    LLM_PROVIDER: Literal['local', 'openai'] = os.getenv("LLM_PROVIDER", "local")
+    LLM_PROVIDER: Literal['local', 'openai'] = "local"
     
     # Model settings
-    MODEL_PATH: str = os.getenv("MODEL_PATH", "models/llama-3-8b-instruct.Q4_K_M.gguf")
-    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    MODEL_PATH: str = "models/llama-3-8b-instruct.Q4_K_M.gguf"
+    EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    EMBEDDING_BACKEND: Literal['torch', 'onnx'] = "torch"  # 'onnx' runs INT8 on CPU
+    ONNX_CACHE_DIR: str = "models/onnx"
+    EMBEDDING_CACHE_PATH: Optional[str] = "cache/embeddings.sqlite3"  # None disables the cache
+    
+    # llama.cpp runtime settings
+    LLAMA_N_BATCH: int = 2048  # Prompt tokens submitted per decode call
+    LLAMA_N_UBATCH: int = 512  # Physical batch size within each decode call
+    LLAMA_N_THREADS: Optional[int] = None  # Defaults to the CPU count, capped at 16
+    LLAMA_KV_CACHE_TYPE: Optional[Literal['q8_0', 'q4_0']] = None  # Quantized KV cache; None keeps f16
     
     # Vector database settings
-    CHROMA_PERSIST_DIRECTORY: str = os.getenv("CHROMA_PERSIST_DIRECTORY", "chroma_db")
-    COLLECTION_NAME: str = os.getenv("COLLECTION_NAME", "regulatory_documents")
+    CHROMA_PERSIST_DIRECTORY: str = "chroma_db"
+    COLLECTION_NAME: str = "regulatory_documents"
     
     # Document processing settings
-    CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "1000"))
-    CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "200"))
+    CHUNK_SIZE: int = 1000
+    CHUNK_OVERLAP: int = 200
+    EMBED_BATCH_SIZE: int = 64
+    INGEST_CONCURRENCY: int = 4
+    PDF_EXTRACT_WORKERS: int = 4  # Processes shared by all PDF extractions, capped at the CPU count
+    VECTORSTORE_BATCH_SIZE: int = 512  # Chunks buffered across documents before a write
+    VECTORSTORE_FLUSH_SECONDS: float = 5.0  # Longest a buffered chunk waits for a write
     
     # LLM generation settings
-    TEMPERATURE: float = float(os.getenv("TEMPERATURE", "0.1"))
-    MAX_TOKENS: int = int(os.getenv("MAX_TOKENS", "2048"))
-    TOP_P: float = float(os.getenv("TOP_P", "0.95"))
-    TOP_K: int = int(os.getenv("TOP_K", "40"))
+    TEMPERATURE: float = 0.1
+    MAX_TOKENS: int = 2048
+    MAX_PROMPT_TOKENS: int = 2048  # Leaves MAX_TOKENS for output in the 4096-token local context
+    TOP_P: float = 0.95
+    TOP_K: int = 40
+    LLM_MAX_BATCH: int = 8  # Requests collected per scheduler batch
+    LLM_BATCH_WINDOW_SECONDS: float = 0.01  # How long the scheduler waits to fill a batch
     
     # RAG settings
-    NUM_RESULTS: int = int(os.getenv("NUM_RESULTS", "5"))
-    SIMILARITY_THRESHOLD: float = float(os.getenv("SIMILARITY_THRESHOLD", "0.7"))
+    NUM_RESULTS: int = 5
+    SIMILARITY_THRESHOLD: float = 0.7
+    RETRIEVAL_BATCH_WINDOW_SECONDS: float = 0.01  # How long concurrent searches wait to share a query
     
     # OpenAI settings
-    OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
-    OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
-    OPENAI_TEMPERATURE: float = float(os.getenv("OPENAI_TEMPERATURE", "0.1"))
-    OPENAI_MAX_TOKENS: int = int(os.getenv("OPENAI_MAX_TOKENS", "4096"))
-    OPENAI_TOP_P: float = float(os.getenv("OPENAI_TOP_P", "0.95"))
-    OPENAI_FREQUENCY_PENALTY: float = float(os.getenv("OPENAI_FREQUENCY_PENALTY", "0.0"))
-    OPENAI_PRESENCE_PENALTY: float = float(os.getenv("OPENAI_PRESENCE_PENALTY", "0.0"))
+    OPENAI_API_KEY: Optional[str] = None
+    OPENAI_MODEL: str = "gpt-4-turbo-preview"
+    OPENAI_TEMPERATURE: float = 0.1
+    OPENAI_MAX_TOKENS: int = 4096
+    OPENAI_TOP_P: float = 0.95
+    OPENAI_FREQUENCY_PENALTY: float = 0.0
+    OPENAI_PRESENCE_PENALTY: float = 0.0
 
-settings = LLMSettings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> LLMSettings:
+    """
+    Get the LLM settings, read from the environment on first use.
+    
+    Returns:
+        LLMSettings: Configuration settings
+    """
+    return LLMSettings()
@@ -1,6 +1,9 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
+import re
+from functools import lru_cache
 from datetime import datetime
+from sqlalchemy import select, bindparam, and_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
@@ -9,144 +12,278 @@ from ..database import SessionLocal
 
 logger = logging.getLogger(__name__)
 
+# Keywords that map words of an LLM category string to RegulationCategory values
+_CATEGORY_MAP = {
+    'financial': models.RegulationCategory.FINANCIAL,
+    'regulation': models.RegulationCategory.FINANCIAL,
+    'regulatory': models.RegulationCategory.FINANCIAL,
+    'consumer': models.RegulationCategory.CONSUMER_PROTECTION,
+    'protection': models.RegulationCategory.CONSUMER_PROTECTION,
+    'risk': models.RegulationCategory.RISK,
+    'management': models.RegulationCategory.RISK,
+    'capital': models.RegulationCategory.CAPITAL,
+    'liquidity': models.RegulationCategory.CAPITAL,
+    'fraud': models.RegulationCategory.FRAUD,
+    'privacy': models.RegulationCategory.DATA_PRIVACY,
+    'data': models.RegulationCategory.DATA_PRIVACY,
+    'aml': models.RegulationCategory.AML,
+    'laundering': models.RegulationCategory.AML,
+    'reporting': models.RegulationCategory.REPORTING,
+    'governance': models.RegulationCategory.GOVERNANCE,
+    'market': models.RegulationCategory.MARKET_CONDUCT,
+    'conduct': models.RegulationCategory.MARKET_CONDUCT,
+    'cyber': models.RegulationCategory.CYBERSECURITY,
+    'security': models.RegulationCategory.CYBERSECURITY,
+    'operational': models.RegulationCategory.OPERATIONAL,
+    'operations': models.RegulationCategory.OPERATIONAL
+}
+
+_CATEGORY_KEYWORDS = frozenset(_CATEGORY_MAP)
+
+_WORD_RE = re.compile(r'[a-z]+')
+
+# Date shapes seen in LLM responses, used to pick the strptime formats worth trying
+_YEAR_RE = re.compile(r'^\d{4}$')
+_YMD_RE = re.compile(r'^\d{4}[-/]\d{1,2}([-/]\d{1,2})?$')
+_DMY_RE = re.compile(r'^\d{1,2}[-/]\d{1,2}[-/]\d{4}$')
+_MONTH_RE = re.compile(r'^[A-Za-z]{3,9}\s')
+
+_YEAR_FORMATS = ("%Y",)  # 2024 (assumes January 1st)
+_YMD_FORMATS = (
+    "%Y-%m-%d",  # 2024-03-15
+    "%Y/%m/%d",  # 2024/03/15
+    "%Y-%m",     # 2024-03 (assumes first of month)
+)
+_DMY_FORMATS = (
+    "%d-%m-%Y",  # 15-03-2024
+    "%d/%m/%Y",  # 15/03/2024
+)
+_MONTH_FORMATS = (
+    "%B %d, %Y", # March 15, 2024
+    "%b %d, %Y", # Mar 15, 2024
+)
+
+# Date values the LLM uses to mean "no date"
+_SPECIAL_DATE_VALUES = frozenset({
+    "ongoing",
+    "continuous",
+    "not specified",
+    "tbd",
+    "to be determined",
+    "n/a",
+    "none",
+})
+
+# Point lookups built once so every call hits the engine's compiled cache
+_REGULATION_BY_ID = select(models.Regulation).where(models.Regulation.id == bindparam("id"))
+_BANK_BY_ID = select(models.Bank).where(models.Bank.id == bindparam("id"))
+
+@lru_cache(maxsize=512)
+def _parse_categories(category_str: str) -> Tuple[models.RegulationCategory, ...]:
+    """
+    Parse a category string into a tuple of RegulationCategory enums.
+    Handles compound categories and maps them to the correct enum values.
+
+    Args:
+        category_str: Category string from LLM response
+
+    Returns:
+        Tuple of RegulationCategory enum values
+    """
+    # Intersect the words of the string with the known category keywords
+    keywords = _CATEGORY_KEYWORDS.intersection(_WORD_RE.findall(category_str.lower()))
+    result_categories = {_CATEGORY_MAP[keyword] for keyword in keywords}
+
+    # If no categories were matched, use OTHER
+    return tuple(result_categories) or (models.RegulationCategory.OTHER,)
+
+@lru_cache(maxsize=512)
+def _parse_date(date_str: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a date string into a datetime object.
+    Handles special values and various date formats.
+
+    Args:
+        date_str: Date string to parse
+
+    Returns:
+        datetime object or None if parsing fails
+    """
+    if not date_str:
+        return None
+
+    # Handle special values
+    if date_str.lower() in _SPECIAL_DATE_VALUES:
+        return None
+
+    # Only try the formats that fit the shape of the string
+    if _YEAR_RE.match(date_str):
+        date_formats = _YEAR_FORMATS
+    elif _YMD_RE.match(date_str):
+        date_formats = _YMD_FORMATS
+    elif _DMY_RE.match(date_str):
+        date_formats = _DMY_FORMATS
+    elif _MONTH_RE.match(date_str):
+        date_formats = _MONTH_FORMATS
+    else:
+        date_formats = ()
+
+    for date_format in date_formats:
+        try:
+            return datetime.strptime(date_str, date_format)
+        except ValueError:
+            continue
+
+    logger.warning(f"Could not parse date: {date_str}")
+    return None
+
+
 class DatabaseUpdater:
     """Handles database updates from LLM responses."""
     
     def __init__(self, db: Session):
         self.db = db
         self._regulation_cache = {}  # Cache for regulation lookups
+        self._wells_fargo = None  # Wells Fargo bank, loaded on first use
         self.WELLS_FARGO_ID = "bank-001"  # Fixed ID for Wells Fargo
     
-    def _parse_categories(self, category_str: str) -> List[models.RegulationCategory]:
+    def _get_regulation(self, regulation_id: str) -> Optional[models.Regulation]:
         """
-        Parse a category string into a list of RegulationCategory enums.
-        Handles compound categories and maps them to the correct enum values.
+        Get a regulation by ID, using cache to avoid repeated queries.
         
         Args:
-            category_str: Category string from LLM response
+            regulation_id: ID of the regulation to find
             
         Returns:
-            List of RegulationCategory enum values
+            Regulation model or None if not found
         """
-        # Split on common delimiters
-        delimiters = ['&', 'and', ',', ';']
-        parts = category_str.strip()
-        for delimiter in delimiters:
-            parts = ' '.join(parts.split(delimiter))
-        categories = [part.strip() for part in parts.split()]
-        
-        # Map to known categories
-        category_mapping = {
-            'financial': models.RegulationCategory.FINANCIAL,
-            'regulation': models.RegulationCategory.FINANCIAL,
-            'regulatory': models.RegulationCategory.FINANCIAL,
-            'consumer': models.RegulationCategory.CONSUMER_PROTECTION,
-            'protection': models.RegulationCategory.CONSUMER_PROTECTION,
-            'risk': models.RegulationCategory.RISK,
-            'management': models.RegulationCategory.RISK,
-            'capital': models.RegulationCategory.CAPITAL,
-            'liquidity': models.RegulationCategory.CAPITAL,
-            'fraud': models.RegulationCategory.FRAUD,
-            'privacy': models.RegulationCategory.DATA_PRIVACY,
-            'data': models.RegulationCategory.DATA_PRIVACY,
-            'aml': models.RegulationCategory.AML,
-            'laundering': models.RegulationCategory.AML,
-            'reporting': models.RegulationCategory.REPORTING,
-            'governance': models.RegulationCategory.GOVERNANCE,
-            'market': models.RegulationCategory.MARKET_CONDUCT,
-            'conduct': models.RegulationCategory.MARKET_CONDUCT,
-            'cyber': models.RegulationCategory.CYBERSECURITY,
-            'security': models.RegulationCategory.CYBERSECURITY,
-            'operational': models.RegulationCategory.OPERATIONAL,
-            'operations': models.RegulationCategory.OPERATIONAL
-        }
+        # Check cache first
+        if regulation_id in self._regulation_cache:
+            return self._regulation_cache[regulation_id]
         
-        result_categories = set()
-        for part in categories:
-            part_lower = part.lower()
-            # Try to match each word to a category
-            for word in part_lower.split():
-                if word in category_mapping:
-                    result_categories.add(category_mapping[word])
+        # Query database and update cache
+        regulation = self.db.execute(_REGULATION_BY_ID, {"id": regulation_id}).scalar_one_or_none()
+        if regulation:
+            self._regulation_cache[regulation_id] = regulation
+        return regulation
+    
+    def _prewarm_regulation_cache(self, data: Dict[str, Any]):
+        """
+        Load every regulation referenced anywhere in the response with one query.
         
-        # If no categories were matched, use OTHER
-        if not result_categories:
-            result_categories.add(models.RegulationCategory.OTHER)
+        Args:
+            data: Dictionary containing the LLM response data
+        """
+        ids = {r.get("id") for r in data.get("regulations", [])}
+        ids.update(m.get("regulation_id") for m in data.get("risk_compliance_mapping", []))
+        for relation in data.get("related_regulations", []):
+            ids.add(relation.get("regulation_id"))
+            ids.add(relation.get("related_regulation_id"))
         
-        return list(result_categories)
-
-    def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
+        self._regulation_cache.update(self._load_by(models.Regulation, "id", ids))
+    
+    def _get_wells_fargo(self) -> Optional[models.Bank]:
+        """Get the Wells Fargo bank entity, reloading it only if it left the session."""
+        if self._wells_fargo is None or self._wells_fargo not in self.db:
+            self._wells_fargo = self.db.execute(_BANK_BY_ID, {"id": self.WELLS_FARGO_ID}).scalar_one_or_none()
+        return self._wells_fargo
+    
+    def _load_by(self, model, column: str, values) -> Dict[Any, Any]:
         """
-        Parse a date string into a datetime object.
-        Handles special values and various date formats.
+        Load every row of a model whose column matches one of the values in a single query.
         
         Args:
-            date_str: Date string to parse
+            model: Model class to query
+            column: Name of the column to match and key the result on
+            values: Iterable of column values to look up
             
         Returns:
-            datetime object or None if parsing fails
+            Dictionary mapping column value to model instance
+        """
+        values = {value for value in values if value is not None}
+        if not values:
+            return {}
+        
+        rows = self.db.query(model).filter(getattr(model, column).in_(values)).all()
+        return {getattr(row, column): row for row in rows}
+    
+    def _assoc_exists(self, table, **cols) -> bool:
         """
-        if not date_str:
-            return None
+        Check for a row in an association table without loading the ORM collection.
+        
+        Args:
+            table: Association table to check
+            **cols: Column values the row must match
             
-        # Handle special values
-        special_values = {
-            "ongoing": None,
-            "continuous": None,
-            "not specified": None,
-            "tbd": None,
-            "to be determined": None,
-            "n/a": None,
-            "none": None,
-        }
+        Returns:
+            True if a matching row exists
+        """
+        stmt = select(1).select_from(table).where(
+            and_(*(table.c[name] == value for name, value in cols.items()))
+        ).limit(1)
+        return self.db.execute(stmt).first() is not None
+    
+    def _sync_categories(self, regulation_id: str, categories: Tuple[models.RegulationCategory, ...]):
+        """
+        Bring a regulation's category rows in line with the parsed categories.
         
-        if date_str.lower() in special_values:
-            return special_values[date_str.lower()]
+        Works on the association table directly so the categories collection is never loaded.
         
-        # Try different date formats
-        date_formats = [
-            "%Y-%m-%d",  # 2024-03-15
-            "%Y/%m/%d",  # 2024/03/15
-            "%d-%m-%Y",  # 15-03-2024
-            "%d/%m/%Y",  # 15/03/2024
-            "%B %d, %Y", # March 15, 2024
-            "%b %d, %Y", # Mar 15, 2024
-            "%Y-%m",     # 2024-03 (assumes first of month)
-            "%Y",        # 2024 (assumes January 1st)
-        ]
+        Args:
+            regulation_id: ID of the regulation to update
+            categories: Categories the regulation should end up with
+        """
+        table = models.RegulationCategoryAssociation.__table__
+        existing = set(self.db.execute(
+            select(table.c.category).where(table.c.regulation_id == regulation_id)
+        ).scalars())
+        desired = set(categories)
         
-        for date_format in date_formats:
-            try:
-                return datetime.strptime(date_str, date_format)
-            except ValueError:
-                continue
+        to_delete = existing - desired
+        if to_delete:
+            self.db.execute(table.delete().where(and_(
+                table.c.regulation_id == regulation_id,
+                table.c.category.in_(to_delete)
+            )))
         
-        logger.warning(f"Could not parse date: {date_str}")
-        return None
+        to_add = desired - existing
+        if to_add:
+            self.db.execute(
+                table.insert(),
+                [{"regulation_id": regulation_id, "category": category} for category in to_add]
+            )
     
-    def _get_regulation(self, regulation_id: str) -> Optional[models.Regulation]:
+    def _insert_new(self, model, rows: Dict[str, Dict[str, Any]], kind: str, results: Dict[str, Any]):
         """
-        Get a regulation by ID, using cache to avoid repeated queries.
+        Insert new rows in one batch, falling back to row-by-row inserts if the batch hits a constraint.
+        
+        Each insert runs in a savepoint, so a clash only discards the offending rows.
         
         Args:
-            regulation_id: ID of the regulation to find
-            
-        Returns:
-            Regulation model or None if not found
+            model: Model class to insert into
+            rows: Mapping of row ID to column values
+            kind: Key of the results["updates"] list to report created rows in
+            results: Results dictionary to update
         """
-        # Check cache first
-        if regulation_id in self._regulation_cache:
-            return self._regulation_cache[regulation_id]
+        # Flush pending updates first so their errors are not blamed on the inserts
+        self.db.flush()
         
-        # Query database and update cache
-        regulation = self.db.query(models.Regulation).filter_by(id=regulation_id).first()
-        if regulation:
-            self._regulation_cache[regulation_id] = regulation
-        return regulation
-    
-    def _get_wells_fargo(self) -> Optional[models.Bank]:
-        """Get the Wells Fargo bank entity."""
-        return self.db.query(models.Bank).filter_by(id=self.WELLS_FARGO_ID).first()
+        try:
+            with self.db.begin_nested():
+                self.db.bulk_insert_mappings(model, list(rows.values()))
+            created = list(rows)
+        except IntegrityError:
+            created = []
+            for row_id, row in rows.items():
+                try:
+                    with self.db.begin_nested():
+                        self.db.bulk_insert_mappings(model, [row])
+                    created.append(row_id)
+                except IntegrityError as e:
+                    results["errors"].append(f"Integrity error creating {kind} {row_id}: {str(e.orig)}")
+        
+        for row_id in created:
+            results["updates"][kind].append(f"Created: {row_id}")
     
     def update_from_llm_response(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -173,40 +310,38 @@ class DatabaseUpdater:
                 "errors": []
             }
             
-            # Clear regulation cache
-            self._regulation_cache = {}
+            # Wells Fargo is only needed to associate regulations
+            wells_fargo = None
+            if data.get("regulations"):
+                wells_fargo = self._get_wells_fargo()
+                if not wells_fargo:
+                    results["errors"].append("Wells Fargo bank not found in database")
+                    return results
             
-            # Get Wells Fargo bank
-            wells_fargo = self._get_wells_fargo()
-            if not wells_fargo:
-                results["errors"].append("Wells Fargo bank not found in database")
-                return results
+            # Reset the regulation cache and fill it for this response
+            self._regulation_cache = {}
+            self._prewarm_regulation_cache(data)
             
             # Process in order of dependencies
-            if "jurisdictions" in data:
+            if data.get("jurisdictions"):
                 self._process_jurisdictions(data["jurisdictions"], results)
-                self.db.flush()  # Ensure jurisdictions are saved
             
-            if "agencies" in data:
+            if data.get("agencies"):
                 self._process_agencies(data["agencies"], results)
-                self.db.flush()  # Ensure agencies are saved
             
-            if "regulations" in data:
+            if data.get("regulations"):
                 self._process_regulations(data["regulations"], results, wells_fargo)
-                self.db.flush()  # Ensure regulations are saved
             
-            if "compliance_steps" in data:
+            if data.get("compliance_steps"):
                 self._process_compliance_steps(data["compliance_steps"], results)
-                self.db.flush()
             
-            if "risk_compliance_mapping" in data:
+            if data.get("risk_compliance_mapping"):
                 self._process_risk_mappings(data["risk_compliance_mapping"], results)
-                self.db.flush()
             
-            if "related_regulations" in data:
+            if data.get("related_regulations"):
                 self._process_related_regulations(data["related_regulations"], results)
-                self.db.flush()
             
+            # Everything is written in this one transaction
             self.db.commit()
             return results
             
@@ -219,45 +354,60 @@ class DatabaseUpdater:
     
     def _process_jurisdictions(self, jurisdictions: List[Dict[str, Any]], results: Dict[str, Any]):
         """Process jurisdiction updates."""
+        # Fetch existing jurisdictions by ID and by code up front
+        by_id = self._load_by(models.Jurisdiction, "id", (j.get("id") for j in jurisdictions))
+        by_code = self._load_by(models.Jurisdiction, "code", (j.get("code") for j in jurisdictions))
+        inserts = {}
+        pending_codes = {}
+        
         for jur_data in jurisdictions:
             try:
-                # First try to find by ID
-                jurisdiction = self.db.query(models.Jurisdiction).filter_by(id=jur_data["id"]).first()
-                
-                # If not found by ID, try to find by code (which should be unique)
-                if not jurisdiction:
-                    jurisdiction = self.db.query(models.Jurisdiction).filter_by(code=jur_data["code"]).first()
+                # First try to find by ID, then by code (which should be unique)
+                jurisdiction = by_id.get(jur_data["id"]) or by_code.get(jur_data["code"])
                 
                 if jurisdiction:
                     # Update existing jurisdiction
+                    by_code.pop(jurisdiction.code, None)
                     jurisdiction.name = jur_data["name"]
                     jurisdiction.code = jur_data["code"]
                     jurisdiction.type = jur_data["type"]
+                    by_code[jurisdiction.code] = jurisdiction
                     results["updates"]["jurisdictions"].append(f"Updated: {jur_data['id']}")
                 else:
-                    # Create new jurisdiction
-                    jurisdiction = models.Jurisdiction(
-                        id=jur_data["id"],
-                        name=jur_data["name"],
-                        code=jur_data["code"],
-                        type=jur_data["type"]
-                    )
-                    self.db.add(jurisdiction)
-                    results["updates"]["jurisdictions"].append(f"Created: {jur_data['id']}")
+                    # Check if another new jurisdiction in this batch already claims the code
+                    if pending_codes.get(jur_data["code"], jur_data["id"]) != jur_data["id"]:
+                        results["updates"]["jurisdictions"].append(
+                            f"Skipped: {jur_data['id']} (code '{jur_data['code']}' already exists)"
+                        )
+                        continue
+                    
+                    # Create new jurisdiction, inserted in one batch below
+                    inserts[jur_data["id"]] = {
+                        "id": jur_data["id"],
+                        "name": jur_data["name"],
+                        "code": jur_data["code"],
+                        "type": jur_data["type"]
+                    }
+                    pending_codes[jur_data["code"]] = jur_data["id"]
                 
             except Exception as e:
                 results["errors"].append(f"Error processing jurisdiction {jur_data.get('id')}: {str(e)}")
+        
+        if inserts:
+            self._insert_new(models.Jurisdiction, inserts, "jurisdictions", results)
     
     def _process_agencies(self, agencies: List[Dict[str, Any]], results: Dict[str, Any]):
         """Process agency updates."""
+        # Fetch existing agencies by ID and by name up front
+        by_id = self._load_by(models.Agency, "id", (a.get("id") for a in agencies))
+        by_name = self._load_by(models.Agency, "name", (a.get("name") for a in agencies))
+        inserts = {}
+        pending_names = {}
+        
         for agency_data in agencies:
             try:
-                # First try to find by ID
-                agency = self.db.query(models.Agency).filter_by(id=agency_data["id"]).first()
-                
-                # If not found by ID, try to find by name
-                if not agency:
-                    agency = self.db.query(models.Agency).filter_by(name=agency_data["name"]).first()
+                # First try to find by ID, then by name
+                agency = by_id.get(agency_data["id"]) or by_name.get(agency_data["name"])
                 
                 if agency:
                     # Update existing agency
@@ -266,55 +416,49 @@ class DatabaseUpdater:
                     
                     # Only update name if it's different and not already taken
                     if agency.name != agency_data["name"]:
-                        existing_with_name = self.db.query(models.Agency).filter_by(name=agency_data["name"]).first()
-                        if not existing_with_name:
+                        if agency_data["name"] not in by_name and agency_data["name"] not in pending_names:
+                            by_name.pop(agency.name, None)
                             agency.name = agency_data["name"]
+                            by_name[agency.name] = agency
                     
                     results["updates"]["agencies"].append(f"Updated: {agency_data['id']}")
                 else:
-                    # Check if an agency with this name already exists
-                    existing_agency = self.db.query(models.Agency).filter_by(name=agency_data["name"]).first()
-                    if existing_agency:
+                    # Check if another new agency in this batch already claims the name
+                    if pending_names.get(agency_data["name"], agency_data["id"]) != agency_data["id"]:
                         # Log that we're skipping this agency due to name conflict
                         results["updates"]["agencies"].append(
                             f"Skipped: {agency_data['id']} (name '{agency_data['name']}' already exists)"
                         )
                         continue
                     
-                    # Create new agency
-                    agency = models.Agency(
-                        id=agency_data["id"],
-                        name=agency_data["name"],
-                        description=agency_data["description"],
-                        website=agency_data.get("website")
-                    )
-                    self.db.add(agency)
-                    results["updates"]["agencies"].append(f"Created: {agency_data['id']}")
+                    # Create new agency, inserted in one batch below
+                    inserts[agency_data["id"]] = {
+                        "id": agency_data["id"],
+                        "name": agency_data["name"],
+                        "description": agency_data["description"],
+                        "website": agency_data.get("website")
+                    }
+                    pending_names[agency_data["name"]] = agency_data["id"]
                 
-                # Commit after each agency to catch any integrity errors early
-                self.db.flush()
-                
-            except IntegrityError as e:
-                self.db.rollback()
-                results["errors"].append(
-                    f"Integrity error processing agency {agency_data.get('id')}: Agency name must be unique"
-                )
             except Exception as e:
                 results["errors"].append(f"Error processing agency {agency_data.get('id')}: {str(e)}")
+        
+        if inserts:
+            self._insert_new(models.Agency, inserts, "agencies", results)
     
     def _process_regulations(self, regulations: List[Dict[str, Any]], results: Dict[str, Any], wells_fargo: models.Bank):
         """Process regulation updates."""
         for reg_data in regulations:
             try:
-                regulation = self.db.query(models.Regulation).filter_by(id=reg_data["id"]).first()
+                regulation = self._regulation_cache.get(reg_data["id"])
                 
                 # Parse dates with flexible format handling
-                effective_date = self._parse_date(reg_data.get("effective_date"))
-                compliance_deadline = self._parse_date(reg_data.get("compliance_deadline"))
-                last_updated = self._parse_date(reg_data.get("last_updated")) or datetime.utcnow()
+                effective_date = _parse_date(reg_data.get("effective_date"))
+                compliance_deadline = _parse_date(reg_data.get("compliance_deadline"))
+                last_updated = _parse_date(reg_data.get("last_updated")) or datetime.utcnow()
                 
                 # Parse categories
-                categories = self._parse_categories(reg_data["category"])
+                categories = _parse_categories(reg_data["category"])
                 
                 if regulation:
                     # Update existing regulation
@@ -329,18 +473,14 @@ class DatabaseUpdater:
                     regulation.source_url = reg_data.get("source_url")
                     regulation.official_reference = reg_data.get("official_reference")
                     
-                    # Update categories
-                    regulation.categories = []
-                    for category in categories:
-                        cat_assoc = models.RegulationCategoryAssociation(
-                            regulation_id=regulation.id,
-                            category=category
-                        )
-                        regulation.categories.append(cat_assoc)
+                    # Update categories, touching only the ones that changed
+                    self._sync_categories(regulation.id, categories)
                     
                     # Ensure Wells Fargo association
-                    if wells_fargo not in regulation.affected_banks:
-                        regulation.affected_banks.append(wells_fargo)
+                    if not self._assoc_exists(models.bank_regulation, regulation_id=regulation.id, bank_id=wells_fargo.id):
+                        self.db.execute(models.bank_regulation.insert().values(
+                            regulation_id=regulation.id, bank_id=wells_fargo.id
+                        ))
                         results["updates"]["bank_associations"].append(
                             f"Associated: {reg_data['id']} -> Wells Fargo"
                         )
@@ -387,9 +527,13 @@ class DatabaseUpdater:
     
     def _process_compliance_steps(self, steps: List[Dict[str, Any]], results: Dict[str, Any]):
         """Process compliance step updates."""
+        # Fetch existing steps up front
+        by_id = self._load_by(models.ComplianceStep, "id", (s.get("id") for s in steps))
+        inserts = {}
+        
         for step_data in steps:
             try:
-                step = self.db.query(models.ComplianceStep).filter_by(id=step_data["id"]).first()
+                step = by_id.get(step_data["id"])
                 
                 if step:
                     # Update existing step
@@ -398,21 +542,29 @@ class DatabaseUpdater:
                     step.order = step_data["order"]
                     results["updates"]["compliance_steps"].append(f"Updated: {step_data['id']}")
                 else:
-                    # Create new step
-                    step = models.ComplianceStep(
-                        id=step_data["id"],
-                        regulation_id=step_data["regulation_id"],
-                        description=step_data["description"],
-                        order=step_data["order"]
-                    )
-                    self.db.add(step)
-                    results["updates"]["compliance_steps"].append(f"Created: {step_data['id']}")
+                    # Create new step, inserted in one batch below
+                    inserts[step_data["id"]] = {
+                        "id": step_data["id"],
+                        "regulation_id": step_data["regulation_id"],
+                        "description": step_data["description"],
+                        "order": step_data["order"]
+                    }
                 
             except Exception as e:
                 results["errors"].append(f"Error processing compliance step {step_data.get('id')}: {str(e)}")
+        
+        if inserts:
+            # Flushes first, so regulations created earlier in this update exist
+            self._insert_new(models.ComplianceStep, inserts, "compliance_steps", results)
     
     def _process_risk_mappings(self, mappings: List[Dict[str, Any]], results: Dict[str, Any]):
         """Process risk compliance mappings."""
+        # Association rows are written directly, so new regulations must exist first
+        self.db.flush()
+        
+        # Fetch the risk assessment units for every compliance area up front
+        units = self._load_by(models.RiskAssessmentUnit, "name", (m.get("compliance_area") for m in mappings))
+        
         for mapping in mappings:
             try:
                 # Use cached regulation lookup
@@ -423,15 +575,17 @@ class DatabaseUpdater:
                     continue
                 
                 # Find risk assessment unit by compliance area
-                unit = self.db.query(models.RiskAssessmentUnit).filter_by(name=mapping["compliance_area"]).first()
+                unit = units.get(mapping["compliance_area"])
                 if not unit:
                     logger.error(f"Risk assessment unit not found: {mapping['compliance_area']}")
                     results["errors"].append(f"Risk assessment unit not found: {mapping['compliance_area']}")
                     continue
                 
                 # Add unit to regulation if not already mapped
-                if unit not in regulation.responsible_units:
-                    regulation.responsible_units.append(unit)
+                if not self._assoc_exists(models.regulation_unit, regulation_id=regulation.id, unit_id=unit.id):
+                    self.db.execute(models.regulation_unit.insert().values(
+                        regulation_id=regulation.id, unit_id=unit.id
+                    ))
                     results["updates"]["risk_mappings"].append(
                         f"Mapped: {mapping['regulation_id']} -> {mapping['compliance_area']}"
                     )
@@ -443,6 +597,9 @@ class DatabaseUpdater:
     
     def _process_related_regulations(self, relations: List[Dict[str, Any]], results: Dict[str, Any]):
         """Process related regulation mappings."""
+        table = models.related_regulations
+        pairs = {}
+        
         for relation in relations:
             try:
                 # Use cached regulation lookups
@@ -453,12 +610,39 @@ class DatabaseUpdater:
                     results["errors"].append(f"One or both regulations not found: {relation}")
                     continue
                 
-                # Add bidirectional relationship if not exists
-                if related_regulation not in regulation.related_regulations:
-                    regulation.related_regulations.append(related_regulation)
-                    results["updates"]["related_regulations"].append(
-                        f"Related: {relation['regulation_id']} <-> {relation['related_regulation_id']}"
-                    )
+                pairs[(regulation.id, related_regulation.id)] = relation
                 
             except Exception as e:
-                results["errors"].append(f"Error processing related regulations: {str(e)}")
\ No newline at end of file
+                results["errors"].append(f"Error processing related regulations: {str(e)}")
+        
+        if not pairs:
+            return
+        
+        try:
+            # Association rows are written directly, so new regulations must exist first
+            self.db.flush()
+            
+            # Skip pairs that are already related, then insert the rest in one batch
+            existing = set(self.db.execute(
+                select(table.c.regulation_id, table.c.related_regulation_id).where(
+                    table.c.regulation_id.in_({regulation_id for regulation_id, _ in pairs})
+                )
+            ).tuples())
+            to_add = [pair for pair in pairs if pair not in existing]
+            
+            if to_add:
+                self.db.execute(
+                    table.insert(),
+                    [
+                        {"regulation_id": regulation_id, "related_regulation_id": related_id}
+                        for regulation_id, related_id in to_add
+                    ]
+                )
+            
+            for pair in to_add:
+                relation = pairs[pair]
+                results["updates"]["related_regulations"].append(
+                    f"Related: {relation['regulation_id']} <-> {relation['related_regulation_id']}"
+                )
+        except Exception as e:
+            results["errors"].append(f"Error processing related regulations: {str(e)}")
@@ -1,18 +1,39 @@
+import asyncio
 import logging
 import os
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import get_context
 from typing import List, Dict, Any, Optional, Tuple
 import pypdf
 import docx2txt
-import re
 
+from .config import get_settings
 from .embeddings import embedding_manager
-from .vectorstore import vectorstore_manager
+from .vectorstore import vectorstore_manager, vectorstore_buffer
 from .graph_rag import graph_rag
 from .llm_provider import llm_provider
+from .pdf_text import page_text, extract_pdf_pages
 
 logger = logging.getLogger(__name__)
 
+# Metadata value types the vector store accepts
+_SIMPLE_METADATA_TYPES = (str, int, float, bool)
+
+# PDFs with more pages than this are extracted across worker processes
+PARALLEL_PDF_MIN_PAGES = 4
+
+# One pool shared by every extraction. Workers are spawned rather than forked so they
+# don't inherit the server's models, CUDA context or open connections; they start on
+# first use and are stopped by shutdown_pdf_pool() when the app shuts down
+PDF_WORKERS = max(1, min(get_settings().PDF_EXTRACT_WORKERS, os.cpu_count() or 1))
+_pdf_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=get_context("spawn"))
+
+def shutdown_pdf_pool():
+    """Stop the PDF extraction worker processes."""
+    _pdf_pool.shutdown(wait=True, cancel_futures=True)
+
 class DocumentProcessor:
     """Process documents and add them to the vector store."""
     
@@ -30,12 +51,8 @@ class DocumentProcessor:
         Returns:
             Dict containing only simple type values (str, int, float, bool)
         """
-        filtered = {}
-        for key, value in metadata.items():
-            # Only include non-None simple type values
-            if value is not None and isinstance(value, (str, int, float, bool)):
-                filtered[key] = value
-        return filtered
+        # None fails the type check, so it is dropped along with complex values
+        return {key: value for key, value in metadata.items() if isinstance(value, _SIMPLE_METADATA_TYPES)}
     
     async def process_document(
         self, 
@@ -65,7 +82,7 @@ class DocumentProcessor:
             if content:
                 text = content
             elif file_path and os.path.exists(file_path):
-                text = self._extract_text_from_file(file_path)
+                text = await asyncio.to_thread(self._extract_text_from_file, file_path)
             elif url:
                 # In a real implementation, this would fetch and process the document from the URL
                 # For now, we'll just use a placeholder
@@ -79,7 +96,7 @@ class DocumentProcessor:
                 return False, None
             
             # Process with Graph RAG
-            rag_results = graph_rag.process_document(text, metadata)
+            rag_results = await asyncio.to_thread(graph_rag.process_document, text, metadata)
             
             if not rag_results:
                 logger.error(f"Graph RAG processing failed for document {document_id}")
@@ -104,24 +121,23 @@ class DocumentProcessor:
                 "processed_at": rag_results.get("timestamp", "")
             })
             
-            chunk_metadatas = []
-            chunk_ids = []
-            
-            for i, chunk in enumerate(chunks):
-                chunk_id = f"{document_id}-chunk-{i}"
-                chunk_metadata = base_metadata.copy()
-                chunk_metadata.update({
-                    "document_id": document_id,
-                    "chunk_id": chunk_id,
-                    "chunk_index": i,
-                    "total_chunks": len(chunks)
-                })
-                chunk_ids.append(chunk_id)
-                chunk_metadatas.append(chunk_metadata)
-            
-            # Add chunks to vector store
-            self.vectorstore_manager.add_texts(
+            base_metadata["document_id"] = document_id
+            base_metadata["total_chunks"] = len(chunks)
+            
+            chunk_ids = [f"{document_id}-chunk-{i}" for i in range(len(chunks))]
+            chunk_metadatas = [
+                {**base_metadata, "chunk_id": chunk_id, "chunk_index": i}
+                for i, chunk_id in enumerate(chunk_ids)
+            ]
+            
+            # Embed all chunks in batches, then add them without re-embedding;
+            # the write is batched with chunks from other documents in flight
+            chunk_embeddings = await asyncio.to_thread(
+                self.embedding_manager.get_embeddings().embed_documents, chunks
+            )
+            await vectorstore_buffer.add(
                 texts=chunks,
+                embeddings=chunk_embeddings,
                 metadatas=chunk_metadatas,
                 ids=chunk_ids
             )
@@ -158,12 +174,18 @@ class DocumentProcessor:
     def _extract_text_from_pdf(self, file_path: str) -> str:
         """Extract text from a PDF file."""
         try:
-            text = ""
             with open(file_path, 'rb') as file:
-                pdf = pypdf.PdfReader(file)
-                for page in pdf.pages:
-                    text += page.extract_text() + "\n"
-            return text
+                pdf = pypdf.PdfReader(file, strict=False)
+                num_pages = len(pdf.pages)
+                if num_pages <= PARALLEL_PDF_MIN_PAGES:
+                    return "".join(page_text(page) for page in pdf.pages)
+            
+            # Extraction is CPU-bound, so split the pages into one range per worker process
+            workers = min(PDF_WORKERS, num_pages)
+            step = -(-num_pages // workers)
+            starts = range(0, num_pages, step)
+            stops = [min(start + step, num_pages) for start in starts]
+            return "".join(_pdf_pool.map(partial(extract_pdf_pages, file_path), starts, stops))
         except Exception as e:
             logger.error(f"Error extracting text from PDF {file_path}: {str(e)}")
             return ""
@@ -179,16 +201,16 @@ class DocumentProcessor:
     def _extract_text_from_txt(self, file_path: str) -> str:
         """Extract text from a TXT file."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
-        except UnicodeDecodeError:
-            # Try with different encoding if UTF-8 fails
+            # Read once and decode in memory
+            with open(file_path, 'rb') as file:
+                data = file.read()
             try:
-                with open(file_path, 'r', encoding='latin-1') as file:
-                    return file.read()
-            except Exception as e:
-                logger.error(f"Error extracting text from TXT {file_path}: {str(e)}")
-                return ""
+                text = data.decode('utf-8')
+            except UnicodeDecodeError:
+                # Fall back to latin-1, which decodes any byte sequence
+                text = data.decode('latin-1')
+            # Match text-mode universal newlines
+            return text.replace('\r\n', '\n').replace('\r', '\n')
         except Exception as e:
             logger.error(f"Error extracting text from TXT {file_path}: {str(e)}")
             return ""
@@ -4,10 +4,16 @@ import requests
 from tqdm import tqdm
 import argparse
 
+# Bytes read per write; large enough that per-chunk Python overhead stays negligible
+CHUNK_SIZE = 1024 * 1024
+
 def download_file(url, destination):
     """
     Download a file from a URL to a destination with progress bar.
     
+    The download goes to a ``.part`` file first and resumes from it with an
+    HTTP Range request if an earlier attempt was interrupted.
+    
     Args:
         url: URL to download from
         destination: Local file path to save to
@@ -20,21 +26,35 @@ def download_file(url, destination):
         print(f"File already exists at {destination}")
         return
     
+    # Resume a partial download if there is one
+    part_path = destination + '.part'
+    resume_from = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    headers = {'Range': f'bytes={resume_from}-'} if resume_from else {}
+    
     # Download with progress bar
     print(f"Downloading from {url} to {destination}")
-    response = requests.get(url, stream=True)
-    total_size = int(response.headers.get('content-length', 0))
-    
-    with open(destination, 'wb') as file, tqdm(
-        desc=os.path.basename(destination),
-        total=total_size,
-        unit='B',
-        unit_scale=True,
-        unit_divisor=1024,
-    ) as bar:
-        for data in response.iter_content(chunk_size=1024):
-            size = file.write(data)
-            bar.update(size)
+    with requests.Session() as session:
+        response = session.get(url, stream=True, headers=headers, timeout=(10, None))
+        response.raise_for_status()
+        
+        # Start over if the server ignored the Range header
+        if response.status_code != 206:
+            resume_from = 0
+        total_size = resume_from + int(response.headers.get('content-length', 0))
+        
+        with open(part_path, 'ab' if resume_from else 'wb') as file, tqdm(
+            desc=os.path.basename(destination),
+            total=total_size,
+            initial=resume_from,
+            unit='B',
+            unit_scale=True,
+            unit_divisor=1024,
+        ) as bar:
+            for data in response.iter_content(chunk_size=CHUNK_SIZE):
+                size = file.write(data)
+                bar.update(size)
+    
+    os.replace(part_path, destination)
 
 def main():
     parser = argparse.ArgumentParser(description='Download LLM model')
@@ -1,11 +1,157 @@
 from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_core.embeddings import Embeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from array import array
+from functools import lru_cache
+from hashlib import blake2b
+from typing import List
 import logging
+import os
+import sqlite3
+import threading
 
-from .config import settings
+from .config import get_settings
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1)
+def is_cuda_available() -> bool:
+    """Check once per process if CUDA is available for GPU acceleration."""
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except ImportError:
+        return False
+
+class QuantizedEmbeddings(Embeddings):
+    """
+    Sentence embeddings from a dynamically INT8-quantized ONNX export of the model.
+    
+    Requires the optional ``optimum[onnxruntime]`` package. The export and
+    quantization run once and are cached under ``cache_dir``.
+    """
+    
+    QUANTIZED_FILE = "model_quantized.onnx"
+    
+    def __init__(self, model_name: str, cache_dir: str, batch_size: int, normalize: bool = True):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+        
+        # Short sentence-transformers names live under that organisation on the hub
+        model_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        export_dir = os.path.join(cache_dir, model_id.replace("/", "--"))
+        
+        if not os.path.exists(os.path.join(export_dir, self.QUANTIZED_FILE)):
+            logger.info(f"Exporting and quantizing {model_id} to {export_dir}")
+            model = ORTModelForFeatureExtraction.from_pretrained(model_id, export=True)
+            model.save_pretrained(export_dir)
+            AutoTokenizer.from_pretrained(model_id).save_pretrained(export_dir)
+            ORTQuantizer.from_pretrained(model).quantize(
+                save_dir=export_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            )
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            export_dir,
+            file_name=self.QUANTIZED_FILE,
+            provider="CPUExecutionProvider"
+        )
+        self.batch_size = batch_size
+        self.normalize = normalize
+    
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """Mean-pool the token embeddings of each text, batch by batch."""
+        import numpy as np
+        
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + self.batch_size],
+                padding=True,
+                truncation=True,
+                return_tensors="np"
+            )
+            hidden = self.model(**inputs).last_hidden_state
+            mask = inputs["attention_mask"][..., None].astype(hidden.dtype)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if self.normalize:
+                pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            vectors.extend(pooled.tolist())
+        return vectors
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of documents."""
+        return self._embed(list(texts))
+    
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query."""
+        return self._embed([text])[0]
+
+class CachedEmbeddings(Embeddings):
+    """
+    Persist document embeddings in SQLite keyed by a hash of the model, its variant and the text.
+    
+    Repeated chunks such as disclaimers and citations are embedded once and
+    read back on later uploads. Queries are passed straight through.
+    """
+    
+    # Stay below SQLite's default limit on bound parameters
+    _LOOKUP_BATCH = 500
+    
+    def __init__(self, embeddings: Embeddings, model_name: str, variant: str, path: str):
+        self.embeddings = embeddings
+        # The backend and precision change the vectors, so they are part of the key
+        self._key_prefix = f"{model_name}\0{variant}\0".encode()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)")
+    
+    def _key(self, text: str) -> bytes:
+        """Hash a text together with the model name and variant."""
+        return blake2b(self._key_prefix + text.encode(), digest_size=16).digest()
+    
+    def _lookup(self, keys: List[bytes]) -> dict:
+        """Load the cached vectors for the given keys."""
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), self._LOOKUP_BATCH):
+                batch = keys[start:start + self._LOOKUP_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                    batch
+                )
+                for key, vector in rows:
+                    found[key] = array('f', vector).tolist()
+        return found
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of documents, computing only the ones not cached yet."""
+        keys = [self._key(text) for text in texts]
+        vectors = self._lookup(list(set(keys)))
+        
+        misses = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if misses:
+            computed = self.embeddings.embed_documents(list(misses.values()))
+            vectors.update(zip(misses, computed))
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(key, array('f', vector).tobytes()) for key, vector in zip(misses, computed)]
+                )
+        
+        return [vectors[key] for key in keys]
+    
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query."""
+        return self.embeddings.embed_query(text)
+
 class EmbeddingManager:
     _instance = None
     
@@ -20,7 +166,7 @@ class EmbeddingManager:
             return
         
         self._initialized = True
-        self.embedding_model_name = settings.EMBEDDING_MODEL
+        self.embedding_model_name = get_settings().EMBEDDING_MODEL
         self.embeddings = None
         self.text_splitter = None
         self.initialized = False
@@ -31,12 +177,45 @@ class EmbeddingManager:
     def _initialize_embeddings(self):
         """Initialize the embedding model."""
         try:
-            # Initialize HuggingFace embeddings
-            self.embeddings = HuggingFaceEmbeddings(
-                model_name=self.embedding_model_name,
-                model_kwargs={'device': 'cuda' if self._is_cuda_available() else 'cpu'},
-                encode_kwargs={'normalize_embeddings': True}
-            )
+            settings = get_settings()
+            use_cuda = is_cuda_available()
+            self.embeddings = None
+            variant = "torch-float16" if use_cuda else "torch-float32"
+            
+            # Quantized ONNX embeddings on CPU when requested and installed
+            if settings.EMBEDDING_BACKEND == "onnx" and not use_cuda:
+                try:
+                    self.embeddings = QuantizedEmbeddings(
+                        model_name=self.embedding_model_name,
+                        cache_dir=settings.ONNX_CACHE_DIR,
+                        batch_size=settings.EMBED_BATCH_SIZE
+                    )
+                    variant = "onnx-int8"
+                except ImportError:
+                    logger.warning("optimum[onnxruntime] is not installed, using PyTorch embeddings")
+            
+            if self.embeddings is None:
+                # Initialize HuggingFace embeddings
+                self.embeddings = HuggingFaceEmbeddings(
+                    model_name=self.embedding_model_name,
+                    model_kwargs={'device': 'cuda' if use_cuda else 'cpu'},
+                    encode_kwargs={
+                        'batch_size': settings.EMBED_BATCH_SIZE,
+                        'normalize_embeddings': True
+                    }
+                )
+                if use_cuda:
+                    # FP16 halves VRAM use and runs on the tensor cores
+                    self.embeddings.client.half()
+            
+            # Reuse embeddings of text seen in earlier documents
+            if settings.EMBEDDING_CACHE_PATH:
+                self.embeddings = CachedEmbeddings(
+                    self.embeddings,
+                    model_name=self.embedding_model_name,
+                    variant=variant,
+                    path=settings.EMBEDDING_CACHE_PATH
+                )
             
             # Initialize text splitter
             self.text_splitter = RecursiveCharacterTextSplitter(
@@ -54,14 +233,6 @@ class EmbeddingManager:
             logger.error(f"Error initializing embeddings: {str(e)}")
             return False
     
-    def _is_cuda_available(self):
-        """Check if CUDA is available for GPU acceleration."""
-        try:
-            import torch
-            return torch.cuda.is_available()
-        except ImportError:
-            return False
-    
     def is_initialized(self):
         """Check if the embeddings are initialized and ready to use."""
         return self.initialized
@@ -1,25 +1,105 @@
 import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Set
 import logging
 from datetime import datetime
-from sentence_transformers import util
+import threading
 import torch
 import json
 
-from .embeddings import embedding_manager
+from .embeddings import embedding_manager, is_cuda_available
 from .vectorstore import vectorstore_manager
 from .llm_provider import llm_provider
-from .config import settings
+from .config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Source nodes sampled when approximating betweenness centrality
+BETWEENNESS_SAMPLES = 100
+
+# Tokens kept back from MAX_PROMPT_TOKENS for the prompt template and metadata
+PROMPT_RESERVE_TOKENS = 512
+
+@lru_cache(maxsize=1)
+def _token_encoder():
+    """Load the tiktoken encoder once, or None if it cannot be loaded (e.g. offline)."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable, estimating token counts: {str(e)}")
+        return None
+
+def _count_tokens(text: str) -> int:
+    """Count the tokens in a text, estimating four characters per token without tiktoken."""
+    encoder = _token_encoder()
+    if encoder is None:
+        return len(text) // 4 + 1
+    return len(encoder.encode(text, disallowed_special=()))
+
+def _pack_context(chunks: List[str], budget: int) -> List[str]:
+    """Greedily keep the highest-ranked chunks that fit in the token budget."""
+    packed = []
+    used = 0
+    for chunk in chunks:
+        tokens = _count_tokens(chunk)
+        if used + tokens <= budget:
+            packed.append(chunk)
+            used += tokens
+    return packed
+
+# Power iteration limits, matching the NetworkX defaults
+PAGERANK_ALPHA = 0.85
+POWER_ITERATIONS = 100
+POWER_TOLERANCE = 1.0e-6
+
+def _pagerank(adjacency: sp.csr_matrix) -> np.ndarray:
+    """Weighted PageRank by power iteration; dangling nodes spread their rank evenly."""
+    n = adjacency.shape[0]
+    out_weight = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inverse_out = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+    
+    rank = np.full(n, 1.0 / n)
+    for _ in range(POWER_ITERATIONS):
+        previous = rank
+        rank = PAGERANK_ALPHA * (adjacency.T @ (previous * inverse_out))
+        rank += (PAGERANK_ALPHA * previous[dangling].sum() + 1 - PAGERANK_ALPHA) / n
+        if np.abs(rank - previous).sum() < n * POWER_TOLERANCE:
+            break
+    return rank
+
+def _eigenvector_centrality(adjacency: sp.csr_matrix) -> np.ndarray:
+    """Unweighted eigenvector centrality by power iteration on A + I."""
+    n = adjacency.shape[0]
+    unweighted = adjacency.copy()
+    unweighted.data[:] = 1.0
+    
+    centrality = np.full(n, 1.0 / n)
+    for _ in range(POWER_ITERATIONS):
+        previous = centrality
+        centrality = previous + unweighted @ previous
+        centrality /= np.linalg.norm(centrality) or 1.0
+        if np.abs(centrality - previous).sum() < n * POWER_TOLERANCE:
+            break
+    return centrality
+
 class GraphRAG:
     """Graph-based Retrieval Augmented Generation for processing large documents."""
     
     def __init__(self):
         self.embedding_manager = embedding_manager
         self.vectorstore_manager = vectorstore_manager
-        self.graph = nx.DiGraph()
+        # Graph of the last processed document, read by query(). Documents are processed
+        # on ingest worker threads, so each builds its graph in locals and only the finished
+        # graph is published here, under the lock.
+        self._lock = threading.Lock()
+        self.texts: List[str] = []  # Chunk text, indexed by node
+        self.adjacency = sp.csr_matrix((0, 0))  # Symmetric similarity-weighted adjacency
+        self.chunk_embeddings = None  # Embeddings of the graph's chunks, indexed by node
+        self.device = "cuda" if is_cuda_available() else "cpu"
         
     def process_document(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -40,18 +120,28 @@ class GraphRAG:
                 logger.warning("No chunks extracted from text")
                 return {}
             
-            # Get embeddings for chunks
+            # Get embeddings for chunks through the shared (batched, cached) embedder,
+            # placed on the GPU in FP16 when one is available
             embeddings = self.embedding_manager.get_embeddings()
-            chunk_embeddings = embeddings.encode(chunks, convert_to_tensor=True)
+            chunk_embeddings = torch.tensor(embeddings.embed_documents(chunks), device=self.device)
+            if self.device == "cuda":
+                chunk_embeddings = chunk_embeddings.half()
             
-            # Calculate similarity matrix
-            similarity_matrix = util.pytorch_cos_sim(chunk_embeddings, chunk_embeddings)
+            # Embeddings are normalized, so cosine similarity is a plain matmul
+            similarity_matrix = chunk_embeddings @ chunk_embeddings.T
             
-            # Build graph
-            self._build_graph(chunks, similarity_matrix)
+            # Build this document's graph
+            texts = list(chunks)
+            adjacency = self._build_graph(similarity_matrix)
             
             # Extract key information using graph analysis
-            key_chunks = self._extract_key_chunks()
+            key_chunks = self._extract_key_chunks(texts, adjacency)
+            
+            # Keep the graph and its embeddings for querying it
+            with self._lock:
+                self.texts = texts
+                self.adjacency = adjacency
+                self.chunk_embeddings = chunk_embeddings
             
             # Generate summaries and extract relationships
             results = self._analyze_chunks(key_chunks, metadata)
@@ -62,69 +152,76 @@ class GraphRAG:
             logger.error(f"Error in graph-based RAG processing: {str(e)}")
             return {}
     
-    def _build_graph(self, chunks: List[str], similarity_matrix: torch.Tensor):
-        """Build a graph from text chunks based on similarity."""
-        # Clear existing graph
-        self.graph.clear()
-        
-        # Add nodes (chunks)
-        for i, chunk in enumerate(chunks):
-            self.graph.add_node(i, text=chunk)
+    @staticmethod
+    def _build_graph(similarity_matrix: torch.Tensor) -> sp.csr_matrix:
+        """Build the chunk graph's adjacency matrix from pairwise similarity."""
+        num_chunks = similarity_matrix.shape[0]
         
-        # Add edges based on similarity
-        threshold = settings.SIMILARITY_THRESHOLD
-        num_chunks = len(chunks)
+        # Threshold on-device and copy only the surviving upper-triangle pairs back
+        threshold = get_settings().SIMILARITY_THRESHOLD
+        mask = torch.triu(similarity_matrix >= threshold, diagonal=1)
+        rows, cols = mask.nonzero(as_tuple=True)
+        weights = similarity_matrix[rows, cols].cpu().numpy().astype(np.float32)
+        rows = rows.cpu().numpy().astype(np.int32)
+        cols = cols.cpu().numpy().astype(np.int32)
         
-        for i in range(num_chunks):
-            for j in range(i + 1, num_chunks):
-                similarity = similarity_matrix[i][j].item()
-                if similarity >= threshold:
-                    self.graph.add_edge(i, j, weight=similarity)
-                    self.graph.add_edge(j, i, weight=similarity)
+        # Store each edge in both directions as a CSR matrix
+        return sp.csr_matrix(
+            (np.concatenate([weights, weights]), (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+            shape=(num_chunks, num_chunks)
+        )
     
-    def _extract_key_chunks(self) -> List[str]:
+    @staticmethod
+    def _neighbors(adjacency: sp.csr_matrix, node: int) -> List[int]:
+        """Get the neighbors of a node, most similar first."""
+        start, end = adjacency.indptr[node], adjacency.indptr[node + 1]
+        order = np.argsort(-adjacency.data[start:end], kind="stable")
+        return adjacency.indices[start:end][order].tolist()
+    
+    def _extract_key_chunks(self, texts: List[str], adjacency: sp.csr_matrix) -> List[str]:
         """Extract key chunks using graph centrality measures."""
         try:
+            num_chunks = len(texts)
+            if not num_chunks:
+                return []
+            
             # Calculate centrality measures
-            pagerank = nx.pagerank(self.graph)
-            betweenness = nx.betweenness_centrality(self.graph)
-            eigenvector = nx.eigenvector_centrality(self.graph)
+            pagerank = _pagerank(adjacency)
+            eigenvector = _eigenvector_centrality(adjacency)
+            # Brandes' algorithm has no sparse-matrix form, so betweenness still
+            # goes through NetworkX; sampled because the exact version is O(V*E)
+            betweenness_by_node = nx.betweenness_centrality(
+                nx.from_scipy_sparse_array(adjacency),
+                k=min(BETWEENNESS_SAMPLES, num_chunks),
+                seed=42
+            )
+            betweenness = np.fromiter(
+                (betweenness_by_node[node] for node in range(num_chunks)),
+                dtype=float,
+                count=num_chunks
+            )
             
             # Combine centrality scores with weights
-            combined_scores = {}
-            for node in self.graph.nodes():
-                combined_scores[node] = (
-                    pagerank.get(node, 0) * 0.4 +  # PageRank for overall importance
-                    betweenness.get(node, 0) * 0.3 +  # Betweenness for bridging concepts
-                    eigenvector.get(node, 0) * 0.3  # Eigenvector for influence
-                )
+            combined_scores = (
+                pagerank * 0.4 +  # PageRank for overall importance
+                betweenness * 0.3 +  # Betweenness for bridging concepts
+                eigenvector * 0.3  # Eigenvector for influence
+            )
             
             # Get top chunks based on combined score
-            top_nodes = sorted(
-                combined_scores.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:settings.NUM_RESULTS]
+            k = min(get_settings().NUM_RESULTS, num_chunks)
+            top_nodes = np.argpartition(-combined_scores, k - 1)[:k]
+            top_nodes = top_nodes[np.argsort(-combined_scores[top_nodes], kind="stable")].tolist()
             
             # Get text of top chunks
-            key_chunks = [
-                self.graph.nodes[node]["text"]
-                for node, _ in top_nodes
-            ]
-            
-            # Add context from neighboring chunks
-            context_chunks = set(key_chunks)
-            for node, _ in top_nodes:
-                # Get immediate neighbors
-                neighbors = list(self.graph.neighbors(node))
-                # Sort neighbors by edge weight
-                neighbors.sort(
-                    key=lambda n: self.graph[node][n]["weight"],
-                    reverse=True
-                )
-                # Add top neighbor chunks
-                for neighbor in neighbors[:2]:  # Add 2 best neighbors
-                    context_chunks.add(self.graph.nodes[neighbor]["text"])
+            key_chunks = [texts[node] for node in top_nodes]
+            
+            # Add context from the 2 most similar neighbors of each top chunk,
+            # keeping rank order so the least important chunks come last
+            context_chunks = dict.fromkeys(key_chunks)
+            for node in top_nodes:
+                for neighbor in self._neighbors(adjacency, node)[:2]:
+                    context_chunks.setdefault(texts[neighbor])
             
             return list(context_chunks)
             
@@ -139,6 +236,10 @@ class GraphRAG:
     ) -> Dict[str, Any]:
         """Analyze key chunks to extract structured information."""
         try:
+            # Keep the prompt inside the model's context window, dropping the
+            # lowest-ranked chunks first
+            chunks = _pack_context(chunks, get_settings().MAX_PROMPT_TOKENS - PROMPT_RESERVE_TOKENS)
+            
             # Combine chunks with metadata for context
             context = "\n\n".join(chunks)
             if metadata:
@@ -265,38 +366,31 @@ Return the relationships in a structured format."""
             Dict containing answer and supporting information
         """
         try:
-            # Get question embedding
-            embeddings = self.embedding_manager.get_embeddings()
-            question_embedding = embeddings.encode(question, convert_to_tensor=True)
-            
-            # Find most relevant chunks
-            relevant_chunks = []
-            for node in self.graph.nodes():
-                chunk = self.graph.nodes[node]["text"]
-                chunk_embedding = embeddings.encode(chunk, convert_to_tensor=True)
-                similarity = util.pytorch_cos_sim(question_embedding, chunk_embedding).item()
-                relevant_chunks.append((node, similarity))
-            
-            # Sort by similarity
-            relevant_chunks.sort(key=lambda x: x[1], reverse=True)
-            
-            # Get top chunk and its neighbors
-            context_chunks = set()
-            if relevant_chunks:
-                top_node = relevant_chunks[0][0]
-                context_chunks.add(self.graph.nodes[top_node]["text"])
-                
-                # Add neighboring chunks
-                neighbors = list(self.graph.neighbors(top_node))
-                neighbors.sort(
-                    key=lambda n: self.graph[top_node][n]["weight"],
-                    reverse=True
+            # One consistent graph, even if a document finishes processing meanwhile
+            with self._lock:
+                texts, adjacency, chunk_embeddings = self.texts, self.adjacency, self.chunk_embeddings
+            
+            # Find the most relevant chunk against the stored chunk embeddings
+            top_similarity = 0
+            context_nodes = []
+            if chunk_embeddings is not None and texts:
+                embeddings = self.embedding_manager.get_embeddings()
+                question_embedding = torch.tensor(
+                    embeddings.embed_query(question),
+                    device=chunk_embeddings.device,
+                    dtype=chunk_embeddings.dtype
                 )
+                similarities = chunk_embeddings @ question_embedding
+                best = torch.max(similarities, dim=0)
+                top_node = best.indices.item()
+                top_similarity = best.values.item()
                 
-                for neighbor in neighbors[:context_size - 1]:
-                    context_chunks.add(self.graph.nodes[neighbor]["text"])
+                # Get top chunk and its neighbors, most relevant first; neighbors are
+                # distinct nodes other than the top one, so nothing needs deduplicating
+                context_nodes = [top_node, *self._neighbors(adjacency, top_node)[:context_size - 1]]
             
             # Generate answer using context
+            context_chunks = [texts[node] for node in context_nodes]
             context = "\n\n".join(context_chunks)
             prompt = f"""Answer the following question using the provided context:
 
@@ -311,8 +405,8 @@ Provide a clear, accurate answer based on the context. If the context doesn't co
             
             return {
                 "answer": answer,
-                "context": list(context_chunks),
-                "confidence": relevant_chunks[0][1] if relevant_chunks else 0
+                "context": context_chunks,
+                "confidence": top_similarity
             }
             
         except Exception as e:
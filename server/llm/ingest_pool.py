@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+from .config import get_settings
+from .document_processor import document_processor
+
+logger = logging.getLogger(__name__)
+
+class IngestPool:
+    """Process queued documents with a bounded number of concurrent workers."""
+    
+    def __init__(self):
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+    
+    def start(self):
+        """Start the worker tasks on the running event loop."""
+        if self.workers:
+            return
+        
+        num_workers = get_settings().INGEST_CONCURRENCY
+        self.queue = asyncio.Queue()
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(num_workers)]
+        logger.info(f"Document ingest pool started with {num_workers} workers")
+    
+    async def stop(self):
+        """Cancel the workers and any documents still waiting in the queue."""
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        
+        while self.queue is not None and not self.queue.empty():
+            future, _, _ = self.queue.get_nowait()
+            future.cancel()
+    
+    def enqueue(
+        self,
+        document_id: str,
+        file_path: Optional[str] = None,
+        url: Optional[str] = None,
+        content: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> "asyncio.Future[Tuple[bool, Optional[Dict[str, Any]]]]":
+        """
+        Queue a document for processing.
+        
+        Args:
+            document_id: Unique identifier for the document
+            file_path: Path to the document file (optional)
+            url: URL of the document (optional)
+            content: Document content as text (optional)
+            metadata: Additional metadata for the document
+            
+        Returns:
+            Future resolving to the result of DocumentProcessor.process_document
+        """
+        if not self.workers:
+            self.start()
+        
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((future, document_id, {
+            "file_path": file_path,
+            "url": url,
+            "content": content,
+            "metadata": metadata
+        }))
+        return future
+    
+    async def _worker(self):
+        """Process documents from the queue one at a time."""
+        while True:
+            future, document_id, kwargs = await self.queue.get()
+            try:
+                if not future.cancelled():
+                    result = await document_processor.process_document(document_id, **kwargs)
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                logger.error(f"Error in ingest worker for document {document_id}: {str(e)}")
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.queue.task_done()
+
+# Singleton instance
+ingest_pool = IngestPool()
@@ -1,13 +1,19 @@
 from typing import Dict, Any, Optional
+import json
 import logging
+import re
 from abc import ABC, abstractmethod
 
 from .model import llm_manager
+from .scheduler import batch_scheduler
 from .openai_client import openai_client
-from .config import settings
+from .config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Outermost JSON object in a model response that may wrap it in prose
+_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
     
@@ -62,12 +68,13 @@ Extract and organize the information into a JSON object with the following struc
   ]
 }}"""
 
-            response = self.llm.generate_response(prompt)
+            # Generate on the scheduler's worker thread so the event loop stays free
+            response = await batch_scheduler.submit(prompt)
             
-            # Parse response as JSON
+            # Parse the JSON object out of the response
             try:
-                import json
-                return json.loads(response)
+                match = _JSON_RE.search(response)
+                return json.loads(match.group(0) if match else response)
             except json.JSONDecodeError:
                 logger.error("Failed to parse LLM response as JSON")
                 return None
@@ -112,9 +119,9 @@ Please provide a response based on the context above."""
             else:
                 full_prompt = prompt
             
-            # Use async client in sync context
-            import asyncio
-            response = asyncio.run(self.client.chat.completions.create(
+            # Use the synchronous client; this method is called from worker threads
+            settings = get_settings()
+            response = self.client.sync_chat_completions_create(
                 model=settings.OPENAI_MODEL,
                 messages=[{"role": "user", "content": full_prompt}],
                 temperature=settings.OPENAI_TEMPERATURE,
@@ -122,7 +129,7 @@ Please provide a response based on the context above."""
                 top_p=settings.OPENAI_TOP_P,
                 frequency_penalty=settings.OPENAI_FREQUENCY_PENALTY,
                 presence_penalty=settings.OPENAI_PRESENCE_PENALTY
-            ))
+            )
             
             return response.choices[0].message.content
             
@@ -136,6 +143,7 @@ class LLMProviderFactory:
     @staticmethod
     def get_provider() -> LLMProvider:
         """Get the configured LLM provider."""
+        settings = get_settings()
         if settings.LLM_PROVIDER == "openai":
             if not settings.OPENAI_API_KEY:
                 logger.warning("OpenAI API key not configured, falling back to local LLM")
@@ -1,19 +1,38 @@
 from langchain_community.llms import LlamaCpp
-from langchain.callbacks.manager import CallbackManager
-from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
+from llama_cpp import llama_supports_gpu_offload
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from langchain_core.output_parsers import StrOutputParser
 import logging
 import os
+import threading
 
-from .config import settings
+from .config import get_settings
 
 logger = logging.getLogger(__name__)
 
 # Create models directory if it doesn't exist
 os.makedirs("models", exist_ok=True)
 
+# ggml type ids accepted by llama.cpp for the KV cache (type_k / type_v)
+KV_CACHE_TYPES = {"q8_0": 8, "q4_0": 2}
+
+# Static head of every prompt. llama.cpp keeps the KV state of the last prompt
+# and only evaluates tokens past the longest shared prefix, so starting every
+# prompt with the same tokens means this is prefilled once per process.
+SYSTEM_PROMPT = "You are an AI assistant specialized in regulatory compliance for financial institutions.\n\n"
+
+# Static pieces around the context and query; tokenized once at model load
+CONTEXT_TEMPLATE = (
+    "Context information:\n",
+    "\n\nUser query: ",
+    "\n\nBased on the context information provided, please answer the user's query. If the context doesn't contain relevant information, say so and provide general information about the topic if possible."
+)
+QUERY_TEMPLATE = (
+    "User query: ",
+    "\n\nPlease answer the user's query based on your knowledge of financial regulations and compliance requirements."
+)
+
 class LLMManager:
     _instance = None
     
@@ -28,9 +47,11 @@ class LLMManager:
             return
         
         self._initialized = True
-        self.model_path = settings.MODEL_PATH
+        self.model_path = get_settings().MODEL_PATH
         self.llm = None
         self.initialized = False
+        # A llama.cpp context can only run one generation at a time
+        self._lock = threading.Lock()
         
         # Try to initialize the model
         self._initialize_model()
@@ -42,24 +63,48 @@ class LLMManager:
                 logger.warning(f"Model file not found at {self.model_path}. LLM will not be available.")
                 return False
             
-            # Set up callback manager for the LLM
-            callback_manager = CallbackManager([StreamingStdOutCallbackHandler()])
+            # Decode is memory-bandwidth bound, so weight precision sets tokens/sec
+            if "q4_k_m" not in os.path.basename(self.model_path).lower():
+                logger.warning(f"{self.model_path} is not a Q4_K_M quantization; generation may be slower than expected.")
             
             # Initialize the LLM
+            settings = get_settings()
+            n_threads = settings.LLAMA_N_THREADS or min(16, os.cpu_count() or 8)
+            model_kwargs = {
+                "n_ubatch": settings.LLAMA_N_UBATCH,
+                "n_threads_batch": n_threads,  # Threads for prompt processing
+            }
+            if settings.LLAMA_KV_CACHE_TYPE:
+                # Halves (q8_0) or quarters (q4_0) the KV bytes read per decoded token;
+                # llama.cpp only quantizes the V cache with flash attention enabled
+                kv_type = KV_CACHE_TYPES[settings.LLAMA_KV_CACHE_TYPE]
+                model_kwargs.update(type_k=kv_type, type_v=kv_type, flash_attn=True)
             self.llm = LlamaCpp(
                 model_path=self.model_path,
                 temperature=settings.TEMPERATURE,
                 max_tokens=settings.MAX_TOKENS,
                 top_p=settings.TOP_P,
                 top_k=settings.TOP_K,
-                callback_manager=callback_manager,
                 verbose=False,
                 n_ctx=4096,  # Context window size
-                n_gpu_layers=-1,  # Auto-detect GPU layers
-                n_batch=512,  # Batch size for prompt processing
+                n_gpu_layers=-1 if llama_supports_gpu_offload() else 0,  # Offload all layers when a GPU backend is built in
+                use_mmap=True,  # Map weights from the file instead of copying them into RAM
+                use_mlock=False,  # Let the OS page weights in on demand
+                n_batch=settings.LLAMA_N_BATCH,  # Batch size for prompt processing
+                n_threads=n_threads,  # Threads for token generation
                 f16_kv=True,  # Use half-precision for key/value cache
+                model_kwargs=model_kwargs,
             )
             
+            # Tokenize the static prompt pieces once; requests only tokenize their own text
+            client = self.llm.client
+            self._system_tokens = client.tokenize(SYSTEM_PROMPT.encode("utf-8"))
+            self._context_tokens = [self._tokenize(piece) for piece in CONTEXT_TEMPLATE]
+            self._query_tokens = [self._tokenize(piece) for piece in QUERY_TEMPLATE]
+            
+            # Prefill the system prompt so the first request already reuses it
+            client.eval(self._system_tokens)
+            
             self.initialized = True
             logger.info(f"LLM initialized successfully with model: {self.model_path}")
             return True
@@ -79,6 +124,24 @@ class LLMManager:
                 raise ValueError("LLM is not initialized and could not be initialized.")
         return self.llm
     
+    def _tokenize(self, text):
+        """Tokenize text for the middle of a prompt (no BOS token)."""
+        return self.llm.client.tokenize(text.encode("utf-8"), add_bos=False)
+    
+    def count_tokens(self, text):
+        """Count the tokens text adds to a prompt, estimating four characters per token without a model."""
+        if not self.initialized:
+            return len(text) // 4 + 1
+        return len(self._tokenize(text))
+    
+    def _prompt_tokens(self, prompt, context=None):
+        """Assemble the prompt from pre-tokenized template pieces, keeping SYSTEM_PROMPT as its fixed prefix."""
+        if context:
+            head, middle, tail = self._context_tokens
+            return self._system_tokens + head + self._tokenize(context) + middle + self._tokenize(prompt) + tail
+        head, tail = self._query_tokens
+        return self._system_tokens + head + self._tokenize(prompt) + tail
+    
     def generate_response(self, prompt, context=None):
         """Generate a response from the LLM based on the prompt and optional context."""
         if not self.initialized:
@@ -86,31 +149,38 @@ class LLMManager:
                 return "I'm sorry, but the language model is not available at the moment. Please try again later."
         
         try:
-            # Create the full prompt with context if provided
-            if context:
-                full_prompt = f"""You are an AI assistant specialized in regulatory compliance for financial institutions.
-                
-Context information:
-{context}
-
-User query: {prompt}
-
-Based on the context information provided, please answer the user's query. If the context doesn't contain relevant information, say so and provide general information about the topic if possible."""
-            else:
-                full_prompt = f"""You are an AI assistant specialized in regulatory compliance for financial institutions.
-
-User query: {prompt}
-
-Please answer the user's query based on your knowledge of financial regulations and compliance requirements."""
-            
             # Generate response
-            response = self.llm.invoke(full_prompt)
-            return response
+            with self._lock:
+                completion = self.llm.client.create_completion(
+                    prompt=self._prompt_tokens(prompt, context),
+                    **self.llm._get_parameters()
+                )
+            return completion["choices"][0]["text"]
             
         except Exception as e:
             logger.error(f"Error generating response: {str(e)}")
             return "I'm sorry, but I encountered an error while processing your request. Please try again later."
     
+    def stream_response(self, prompt, context=None):
+        """Yield the response to the prompt token by token as it is generated."""
+        if not self.initialized:
+            if not self._initialize_model():
+                yield "I'm sorry, but the language model is not available at the moment. Please try again later."
+                return
+        
+        try:
+            with self._lock:
+                for chunk in self.llm.client.create_completion(
+                    prompt=self._prompt_tokens(prompt, context),
+                    stream=True,
+                    **self.llm._get_parameters()
+                ):
+                    yield chunk["choices"][0]["text"]
+                
+        except Exception as e:
+            logger.error(f"Error streaming response: {str(e)}")
+            yield "I'm sorry, but I encountered an error while processing your request. Please try again later."
+    
     def create_chain(self, prompt_template):
         """Create an LLMChain with the given prompt template."""
         if not self.initialized:
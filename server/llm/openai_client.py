@@ -1,81 +1,25 @@
 from typing import Dict, Any, Optional
-import json
 from openai import OpenAI, AsyncOpenAI
-import logging
+import aiohttp
+import orjson
 import asyncio
+import logging
 from contextlib import asynccontextmanager
 
 from .openai_config import settings, validate_api_key
 
 logger = logging.getLogger(__name__)
 
-class OpenAIClient:
-    """Client for interacting with OpenAI API."""
-    
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(OpenAIClient, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
-    def __init__(self):
-        if self._initialized:
-            return
-            
-        self._initialized = True
-        self.client = None
-        self._client_lock = asyncio.Lock()
-        
-        # Initialize client if API key is configured
-        if validate_api_key():
-            try:
-                # Initialize async client
-                self.client = AsyncOpenAI(
-                    api_key=settings.OPENAI_API_KEY
-                )
-                logger.info("OpenAI client initialized successfully")
-            except Exception as e:
-                logger.error(f"Error initializing OpenAI client: {str(e)}")
-    
-    def is_available(self) -> bool:
-        """Check if OpenAI client is available."""
-        return self.client is not None
-    
-    @asynccontextmanager
-    async def get_client(self):
-        """Get the OpenAI client with proper cleanup."""
-        if not self.is_available():
-            raise ValueError("OpenAI client not available")
-            
-        async with self._client_lock:
-            try:
-                yield self.client
-            finally:
-                # Ensure proper cleanup
-                if hasattr(self.client, 'close'):
-                    await self.client.close()
-                elif hasattr(self.client.http_client, 'aclose'):
-                    await self.client.http_client.aclose()
-    
-    async def analyze_document(self, text: str) -> Optional[Dict[str, Any]]:
-        """
-        Analyze document text using OpenAI to extract regulatory information.
-        
-        Args:
-            text: Document text to analyze
-            
-        Returns:
-            Dict containing structured regulatory data or None if analysis fails
-        """
-        if not self.is_available():
-            logger.error("OpenAI client not available")
-            return None
-        
-        try:
-            # Prepare the system message with output format instructions
-            system_message = """You are a regulatory compliance expert. Analyze the provided document and extract structured information about regulations, agencies, jurisdictions, compliance steps, and risk assessment mappings.
+# Connection pool size for concurrent document analyses
+MAX_CONNECTIONS = 100
+
+# Retry policy for transient failures (rate limits, server errors, dropped connections)
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 1.0
+RETRY_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+# System message with output format instructions, shared by every analysis
+_SYSTEM_PROMPT = """You are a regulatory compliance expert. Analyze the provided document and extract structured information about regulations, agencies, jurisdictions, compliance steps, and risk assessment mappings.
 
 Your response should be a JSON object with the following structure:
 {
@@ -132,30 +76,168 @@ Your response should be a JSON object with the following structure:
     }
   ]
 }"""
+
+_SYSTEM_MESSAGE = {"role": "system", "content": _SYSTEM_PROMPT}
+
+class OpenAIClient:
+    """Client for interacting with OpenAI API."""
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(OpenAIClient, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
             
-            async with self.get_client() as client:
-                # Create chat completion
-                response = await client.chat.completions.create(
-                    model=settings.OPENAI_MODEL,
-                    messages=[
-                        {"role": "system", "content": system_message},
-                        {"role": "user", "content": text}
-                    ],
-                    temperature=settings.OPENAI_TEMPERATURE,
-                    max_tokens=settings.OPENAI_MAX_TOKENS,
-                    top_p=settings.OPENAI_TOP_P,
-                    frequency_penalty=settings.OPENAI_FREQUENCY_PENALTY,
-                    presence_penalty=settings.OPENAI_PRESENCE_PENALTY,
-                    response_format={"type": "json_object"}
+        self._initialized = True
+        self.client = None
+        self.sync_client = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Initialize client if API key is configured
+        if validate_api_key():
+            try:
+                # Initialize async client
+                self.client = AsyncOpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    max_retries=MAX_RETRIES
                 )
-                
-                # Extract and parse the JSON response
-                if response.choices and response.choices[0].message.content:
-                    try:
-                        return json.loads(response.choices[0].message.content)
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Error parsing OpenAI response as JSON: {str(e)}")
+                # Synchronous client for callers that are not on the event loop
+                self.sync_client = OpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    max_retries=MAX_RETRIES
+                )
+                logger.info("OpenAI client initialized successfully")
+            except Exception as e:
+                logger.error(f"Error initializing OpenAI client: {str(e)}")
+    
+    def is_available(self) -> bool:
+        """Check if OpenAI client is available."""
+        return self.client is not None
+    
+    @asynccontextmanager
+    async def get_client(self):
+        """Get the shared OpenAI client; it stays open until close() is called."""
+        if not self.is_available():
+            raise ValueError("OpenAI client not available")
+        yield self.client
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared aiohttp session, creating it on the running event loop."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={
+                    "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
+                    "Content-Type": "application/json"
+                },
+                connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS, limit_per_host=MAX_CONNECTIONS),
+                timeout=aiohttp.ClientTimeout(total=600, sock_connect=5)  # The OpenAI SDK defaults
+            )
+        return self._session
+    
+    async def _post_chat_completion(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        POST a chat completion over the pooled session, retrying transient failures.
+        
+        Retries back off exponentially, or wait as long as the Retry-After header asks.
+        
+        Returns:
+            The decoded response body, or None if the API returned an error
+        """
+        url = f"{self.client.base_url}chat/completions"
+        data = orjson.dumps(payload)
+        for attempt in range(MAX_RETRIES + 1):
+            delay = RETRY_BACKOFF_SECONDS * 2 ** attempt
+            try:
+                async with self._get_session().post(url, data=data) as resp:
+                    # Reading the whole body returns the connection to the pool
+                    raw = await resp.read()
+                    if resp.status == 200:
+                        return orjson.loads(raw)
+                    if resp.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                        logger.error(f"OpenAI API returned {resp.status}: {raw[:500]!r}")
                         return None
+                    try:
+                        delay = float(resp.headers.get("Retry-After", delay))
+                    except ValueError:
+                        pass
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                logger.warning(f"OpenAI request failed, retrying: {str(e)}")
+            
+            await asyncio.sleep(delay)
+    
+    async def close(self):
+        """Close the pooled HTTP connections; call once on application shutdown."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        if self.client is not None:
+            await self.client.close()
+        if self.sync_client is not None:
+            self.sync_client.close()
+    
+    def sync_chat_completions_create(self, **kwargs):
+        """
+        Create a chat completion with the synchronous client.
+        
+        Args:
+            **kwargs: Arguments for chat.completions.create
+            
+        Returns:
+            The chat completion response
+        """
+        if self.sync_client is None:
+            raise ValueError("OpenAI client not available")
+        return self.sync_client.chat.completions.create(**kwargs)
+    
+    async def analyze_document(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Analyze document text using OpenAI to extract regulatory information.
+        
+        Args:
+            text: Document text to analyze
+            
+        Returns:
+            Dict containing structured regulatory data or None if analysis fails
+        """
+        if not self.is_available():
+            logger.error("OpenAI client not available")
+            return None
+        
+        try:
+            # Post directly over the pooled aiohttp session; under many concurrent
+            # analyses this outperforms the SDK's httpx transport
+            payload = {
+                "model": settings.OPENAI_MODEL,
+                "messages": [
+                    _SYSTEM_MESSAGE,
+                    {"role": "user", "content": text}
+                ],
+                "temperature": settings.OPENAI_TEMPERATURE,
+                "max_tokens": settings.OPENAI_MAX_TOKENS,
+                "top_p": settings.OPENAI_TOP_P,
+                "frequency_penalty": settings.OPENAI_FREQUENCY_PENALTY,
+                "presence_penalty": settings.OPENAI_PRESENCE_PENALTY,
+                "response_format": {"type": "json_object"}
+            }
+            body = await self._post_chat_completion(payload)
+            if body is None:
+                return None
+            
+            # Extract and parse the JSON response
+            choices = body.get("choices")
+            if choices and choices[0]["message"].get("content"):
+                try:
+                    return orjson.loads(choices[0]["message"]["content"])
+                except orjson.JSONDecodeError as e:
+                    logger.error(f"Error parsing OpenAI response as JSON: {str(e)}")
+                    return None
             
             return None
             
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-import os
+from functools import lru_cache
 from typing import Optional
 import logging
 
@@ -31,18 +31,8 @@ def load_settings() -> OpenAISettings:
         OpenAISettings: Configuration settings
     """
     try:
-        settings = OpenAISettings()
-        
-        # Override settings from environment variables
-        settings.OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", settings.OPENAI_API_KEY)
-        settings.OPENAI_MODEL = os.environ.get("OPENAI_MODEL", settings.OPENAI_MODEL)
-        settings.OPENAI_TEMPERATURE = float(os.environ.get("OPENAI_TEMPERATURE", settings.OPENAI_TEMPERATURE))
-        settings.OPENAI_MAX_TOKENS = int(os.environ.get("OPENAI_MAX_TOKENS", settings.OPENAI_MAX_TOKENS))
-        settings.OPENAI_TOP_P = float(os.environ.get("OPENAI_TOP_P", settings.OPENAI_TOP_P))
-        settings.OPENAI_FREQUENCY_PENALTY = float(os.environ.get("OPENAI_FREQUENCY_PENALTY", settings.OPENAI_FREQUENCY_PENALTY))
-        settings.OPENAI_PRESENCE_PENALTY = float(os.environ.get("OPENAI_PRESENCE_PENALTY", settings.OPENAI_PRESENCE_PENALTY))
-        
-        return settings
+        # BaseSettings already gives environment variables precedence over .env
+        return OpenAISettings()
     except Exception as e:
         logger.error(f"Error loading OpenAI settings: {str(e)}")
         return OpenAISettings()
@@ -50,10 +40,14 @@ def load_settings() -> OpenAISettings:
 # Create settings instance
 settings = load_settings()
 
+@lru_cache(maxsize=1)
 def validate_api_key() -> bool:
     """
     Validate that the OpenAI API key is configured.
     
+    The settings are loaded once at import, so the result is cached; this keeps
+    /health polls from re-running the check and re-logging its errors.
+    
     Returns:
         bool: True if API key is configured, False otherwise
     """
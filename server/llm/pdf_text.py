@@ -0,0 +1,13 @@
+import pypdf
+
+# Kept apart from document_processor so the spawned extraction workers only import pypdf,
+# not the embedding model and vector store
+
+def page_text(page: pypdf.PageObject) -> str:
+    """Extract a PDF page's text in plain (non-layout) mode, newline-terminated."""
+    return (page.extract_text(extraction_mode="plain") or "") + "\n"
+
+def extract_pdf_pages(file_path: str, start: int, stop: int) -> str:
+    """Extract the text of a range of PDF pages; runs in a worker process."""
+    pdf = pypdf.PdfReader(file_path, strict=False)
+    return "".join(page_text(pdf.pages[i]) for i in range(start, stop))
@@ -1,12 +1,17 @@
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union, Iterator
+import asyncio
 import logging
 
 from .model import llm_manager
-from .vectorstore import vectorstore_manager
-from .config import settings
+from .scheduler import batch_scheduler
+from .vectorstore import vectorstore_manager, vectorstore_query_batcher
+from .config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Tokens kept back from MAX_PROMPT_TOKENS for the system prompt and template text
+PROMPT_RESERVE_TOKENS = 128
+
 class RAGEngine:
     """Retrieval-Augmented Generation engine for answering questions."""
     
@@ -14,55 +19,65 @@ class RAGEngine:
         self.llm_manager = llm_manager
         self.vectorstore_manager = vectorstore_manager
     
-    def answer_question(self, question: str, filter_metadata: Optional[Dict[str, Any]] = None) -> Tuple[str, List[Dict[str, Any]]]:
+    async def _generate(self, question: str, context: Optional[str], stream: bool) -> Union[str, Iterator[str]]:
+        """Stream tokens directly, or queue a full generation on the batch scheduler."""
+        if stream:
+            return self.llm_manager.stream_response(question, context)
+        return await batch_scheduler.submit(question, context)
+    
+    async def answer_question(self, question: str, filter_metadata: Optional[Dict[str, Any]] = None, stream: bool = False) -> Tuple[Union[str, Iterator[str]], List[Dict[str, Any]]]:
         """
         Answer a question using RAG.
         
         Args:
             question: The question to answer
             filter_metadata: Optional metadata to filter documents by
+            stream: Return the answer as an iterator of tokens instead of a string
             
         Returns:
             Tuple containing:
-                - The generated answer
+                - The generated answer, or an iterator over its tokens when streaming
                 - List of source documents with metadata
         """
         try:
             # Retrieve relevant documents
-            docs_with_scores = self.vectorstore_manager.similarity_search_with_score(
+            settings = get_settings()
+            docs_with_scores = await vectorstore_query_batcher.similarity_search_with_score(
                 query=question,
                 k=settings.NUM_RESULTS,
-                filter=filter_metadata
+                filter=filter_metadata,
+                min_score=settings.SIMILARITY_THRESHOLD
             )
             
-            # Filter documents by similarity threshold
-            filtered_docs = []
-            for doc, score in docs_with_scores:
-                # Convert score to similarity (depends on the embedding model)
-                # For cosine similarity, higher is better (closer to 1)
-                if score >= settings.SIMILARITY_THRESHOLD:
-                    filtered_docs.append(doc)
+            # Only documents meeting the similarity threshold are returned
+            filtered_docs = [doc for doc, _ in docs_with_scores]
+            
+            # Keep the best-ranked documents that fit the prompt token budget
+            budget = settings.MAX_PROMPT_TOKENS - PROMPT_RESERVE_TOKENS - self.llm_manager.count_tokens(question)
+            context_docs = []
+            sections = []
+            for doc in filtered_docs:
+                section = f"Document {len(sections)+1}:\n{doc.page_content}"
+                tokens = self.llm_manager.count_tokens(section)
+                if tokens <= budget:
+                    context_docs.append(doc)
+                    sections.append(section)
+                    budget -= tokens
             
             # If no relevant documents found
-            if not filtered_docs:
-                answer = self.llm_manager.generate_response(
-                    prompt=question,
-                    context=None
-                )
+            if not context_docs:
+                answer = await self._generate(question, None, stream)
                 return answer, []
             
             # Prepare context from retrieved documents
-            context = "\n\n".join([f"Document {i+1}:\n{doc.page_content}" for i, doc in enumerate(filtered_docs)])
+            context = "\n\n".join(sections)
             
             # Generate answer
-            answer = self.llm_manager.generate_response(
-                prompt=question,
-                context=context
-            )
+            answer = await self._generate(question, context, stream)
             
             # Prepare source documents with metadata
             sources = []
-            for doc in filtered_docs:
+            for doc in context_docs:
                 if hasattr(doc, 'metadata'):
                     sources.append(doc.metadata)
             
@@ -72,11 +87,25 @@ class RAGEngine:
             logger.error(f"Error in RAG answer generation: {str(e)}")
             # Fallback to direct LLM response
             try:
-                answer = self.llm_manager.generate_response(question)
+                answer = await self._generate(question, None, stream)
                 return answer, []
             except Exception as e2:
                 logger.error(f"Error in fallback answer generation: {str(e2)}")
-                return "I'm sorry, but I encountered an error while processing your request. Please try again later.", []
+                error = "I'm sorry, but I encountered an error while processing your request. Please try again later."
+                return (iter([error]) if stream else error), []
+    
+    async def answer_questions(self, questions: List[str], filter_metadata: Optional[Dict[str, Any]] = None) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Answer several questions concurrently; their retrievals share one vector store query.
+        
+        Args:
+            questions: The questions to answer
+            filter_metadata: Optional metadata to filter documents by
+            
+        Returns:
+            List of (answer, sources) tuples in the order of the questions
+        """
+        return await asyncio.gather(*(self.answer_question(question, filter_metadata) for question in questions))
 
 # Singleton instance
 rag_engine = RAGEngine()
\ No newline at end of file
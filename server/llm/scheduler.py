@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from .config import get_settings
+from .model import llm_manager
+
+logger = logging.getLogger(__name__)
+
+class BatchScheduler:
+    """Coalesce concurrent generation requests and run them on the single llama.cpp context."""
+    
+    def __init__(self):
+        self.queue: Optional[asyncio.Queue] = None
+        self.worker: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the batching task on the running event loop."""
+        if self.worker is not None:
+            return
+        
+        self.queue = asyncio.Queue()
+        self.worker = asyncio.create_task(self._run())
+        logger.info("LLM batch scheduler started")
+    
+    async def stop(self):
+        """Cancel the batching task and any requests still waiting in the queue."""
+        if self.worker is not None:
+            self.worker.cancel()
+            await asyncio.gather(self.worker, return_exceptions=True)
+            self.worker = None
+        
+        while self.queue is not None and not self.queue.empty():
+            _, future = self.queue.get_nowait()
+            future.cancel()
+    
+    async def submit(self, prompt: str, context: Optional[str] = None) -> str:
+        """
+        Queue a prompt and wait for its response.
+        
+        Args:
+            prompt: The user query
+            context: Optional retrieved context for the query
+        
+        Returns:
+            The generated response, as returned by LLMManager.generate_response
+        """
+        if self.worker is None:
+            self.start()
+        
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait(((prompt, context), future))
+        return await future
+    
+    async def _run(self):
+        """Collect requests into batches and generate each distinct prompt once."""
+        loop = asyncio.get_running_loop()
+        while True:
+            settings = get_settings()
+            batch = [await self.queue.get()]
+            deadline = loop.time() + settings.LLM_BATCH_WINDOW_SECONDS
+            while len(batch) < settings.LLM_MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Identical questions over identical context share one generation
+            waiters: Dict[Tuple[str, Optional[str]], List[asyncio.Future]] = {}
+            for key, future in batch:
+                if not future.cancelled():
+                    waiters.setdefault(key, []).append(future)
+            
+            try:
+                # One thread hop per batch; each response is delivered as soon as it is ready
+                await asyncio.to_thread(self._generate_batch, loop, waiters)
+            except Exception as e:
+                logger.error(f"Error in LLM batch scheduler: {str(e)}")
+                for futures in waiters.values():
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(e)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+    
+    @staticmethod
+    def _generate_batch(loop: asyncio.AbstractEventLoop, waiters: Dict[Tuple[str, Optional[str]], List[asyncio.Future]]):
+        """Run the batch back to back on the llama.cpp context (worker thread)."""
+        for (prompt, context), futures in waiters.items():
+            response = llm_manager.generate_response(prompt, context)
+            for future in futures:
+                loop.call_soon_threadsafe(BatchScheduler._resolve, future, response)
+    
+    @staticmethod
+    def _resolve(future: asyncio.Future, response: str):
+        if not future.done():
+            future.set_result(response)
+
+# Singleton instance
+batch_scheduler = BatchScheduler()
@@ -1,13 +1,21 @@
 from langchain_chroma import Chroma
+from langchain_core.documents import Document
 import chromadb
+from collections import OrderedDict
+import asyncio
 import logging
 import os
+import threading
+import uuid
 
-from .config import settings
-from .embeddings import embedding_manager
+from .config import get_settings
+from .embeddings import embedding_manager, CachedEmbeddings
 
 logger = logging.getLogger(__name__)
 
+# Number of recent query embeddings kept in memory
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
 class VectorStoreManager:
     _instance = None
     
@@ -22,10 +30,13 @@ class VectorStoreManager:
             return
         
         self._initialized = True
+        settings = get_settings()
         self.persist_directory = settings.CHROMA_PERSIST_DIRECTORY
         self.collection_name = settings.COLLECTION_NAME
         self.vectorstore = None
         self.initialized = False
+        self._query_embeddings = OrderedDict()  # normalized query -> embedding, LRU order
+        self._query_embeddings_lock = threading.Lock()
         
         # Create persist directory if it doesn't exist
         os.makedirs(self.persist_directory, exist_ok=True)
@@ -68,18 +79,72 @@ class VectorStoreManager:
                 raise ValueError("Vector store is not initialized and could not be initialized.")
         return self.vectorstore
     
+    def _embed_queries(self, queries):
+        """Embed queries, reusing recent embeddings and computing the misses in one batch."""
+        keys = [" ".join(query.split()) for query in queries]
+        with self._query_embeddings_lock:
+            vectors = {key: self._query_embeddings[key] for key in keys if key in self._query_embeddings}
+            for key in vectors:
+                self._query_embeddings.move_to_end(key)
+        
+        misses = list(dict.fromkeys(key for key in keys if key not in vectors))
+        if misses:
+            embeddings = embedding_manager.get_embeddings()
+            if isinstance(embeddings, CachedEmbeddings):
+                # Queries are one-off; keep them out of the persistent document cache
+                embeddings = embeddings.embeddings
+            computed = dict(zip(misses, embeddings.embed_documents(misses)))
+            vectors.update(computed)
+            
+            with self._query_embeddings_lock:
+                self._query_embeddings.update(computed)
+                while len(self._query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                    self._query_embeddings.popitem(last=False)
+        
+        return [vectors[key] for key in keys]
+    
     def add_texts(self, texts, metadatas=None, ids=None):
-        """Add texts to the vector store."""
+        """Add texts to the vector store, embedding them in batches of EMBED_BATCH_SIZE."""
         if not self.initialized:
             if not self._initialize_vectorstore():
                 raise ValueError("Vector store is not initialized and could not be initialized.")
         
         try:
-            return self.vectorstore.add_texts(texts=texts, metadatas=metadatas, ids=ids)
+            texts = list(texts)
+            ids = ids or [uuid.uuid4().hex for _ in texts]
+            embeddings = embedding_manager.get_embeddings()
+            batch_size = get_settings().EMBED_BATCH_SIZE
+            for start in range(0, len(texts), batch_size):
+                batch = texts[start:start + batch_size]
+                self.add_embeddings(
+                    texts=batch,
+                    embeddings=embeddings.embed_documents(batch),
+                    ids=ids[start:start + batch_size],
+                    metadatas=metadatas[start:start + batch_size] if metadatas else None
+                )
+            return ids
         except Exception as e:
             logger.error(f"Error adding texts to vector store: {str(e)}")
             raise
     
+    def add_embeddings(self, texts, embeddings, ids, metadatas=None):
+        """Add texts with precomputed embeddings to the vector store, skipping re-embedding."""
+        if not self.initialized:
+            if not self._initialize_vectorstore():
+                raise ValueError("Vector store is not initialized and could not be initialized.")
+        
+        try:
+            self.vectorstore._collection.upsert(
+                ids=ids,
+                embeddings=embeddings,
+                documents=texts,
+                metadatas=metadatas
+            )
+            return ids
+        except Exception as e:
+            logger.error(f"Error adding embeddings to vector store: {str(e)}")
+            raise
+    
     def similarity_search(self, query, k=None, filter=None):
         """Search for similar documents in the vector store."""
         if not self.initialized:
@@ -87,7 +152,7 @@ class VectorStoreManager:
                 raise ValueError("Vector store is not initialized and could not be initialized.")
         
         try:
-            k = k or settings.NUM_RESULTS
+            k = k or get_settings().NUM_RESULTS
             return self.vectorstore.similarity_search(query=query, k=k, filter=filter)
         except Exception as e:
             logger.error(f"Error searching vector store: {str(e)}")
@@ -100,12 +165,75 @@ class VectorStoreManager:
                 raise ValueError("Vector store is not initialized and could not be initialized.")
         
         try:
-            k = k or settings.NUM_RESULTS
-            return self.vectorstore.similarity_search_with_score(query=query, k=k, filter=filter)
+            k = k or get_settings().NUM_RESULTS
+            return self.vectorstore.similarity_search_by_vector_with_relevance_scores(
+                embedding=self._embed_queries([query])[0],
+                k=k,
+                filter=filter
+            )
         except Exception as e:
             logger.error(f"Error searching vector store with scores: {str(e)}")
             return []
     
+    def batch_similarity_search_with_score(self, queries, k=None, filter=None, min_score=None):
+        """
+        Search for several queries with one embedding call and one collection query.
+        
+        When min_score is given, only hits scoring at least min_score are kept, and
+        their documents and metadata are loaded in a single follow-up lookup instead
+        of being returned for every candidate.
+        """
+        if not self.initialized:
+            if not self._initialize_vectorstore():
+                raise ValueError("Vector store is not initialized and could not be initialized.")
+        
+        try:
+            k = k or get_settings().NUM_RESULTS
+            collection = self.vectorstore._collection
+            query_embeddings = self._embed_queries(queries)
+            if min_score is None:
+                results = collection.query(
+                    query_embeddings=query_embeddings,
+                    n_results=k,
+                    where=filter,
+                    include=["documents", "metadatas", "distances"]
+                )
+                return [
+                    [
+                        (Document(page_content=text, metadata=metadata or {}), distance)
+                        for text, metadata, distance in zip(texts, metadatas, distances)
+                    ]
+                    for texts, metadatas, distances in zip(results["documents"], results["metadatas"], results["distances"])
+                ]
+            
+            results = collection.query(
+                query_embeddings=query_embeddings,
+                n_results=k,
+                where=filter,
+                include=["distances"]
+            )
+            hits = [
+                [(chunk_id, distance) for chunk_id, distance in zip(ids, distances) if distance >= min_score]
+                for ids, distances in zip(results["ids"], results["distances"])
+            ]
+            
+            kept_ids = list({chunk_id for query_hits in hits for chunk_id, _ in query_hits})
+            if not kept_ids:
+                return [[] for _ in queries]
+            
+            kept = collection.get(ids=kept_ids, include=["documents", "metadatas"])
+            docs = {
+                chunk_id: Document(page_content=text, metadata=metadata or {})
+                for chunk_id, text, metadata in zip(kept["ids"], kept["documents"], kept["metadatas"])
+            }
+            return [
+                [(docs[chunk_id], distance) for chunk_id, distance in query_hits if chunk_id in docs]
+                for query_hits in hits
+            ]
+        except Exception as e:
+            logger.error(f"Error batch searching vector store with scores: {str(e)}")
+            return [[] for _ in queries]
+    
     def delete(self, ids=None, filter=None):
         """Delete documents from the vector store."""
         if not self.initialized:
@@ -126,5 +254,139 @@ class VectorStoreManager:
             logger.error(f"Error deleting from vector store: {str(e)}")
             return False
 
-# Singleton instance
-vectorstore_manager = VectorStoreManager()
\ No newline at end of file
+class VectorStoreBuffer:
+    """
+    Coalesce chunk writes from concurrently processed documents into larger upserts.
+    
+    Chunks are written once the buffer holds max_batch chunks or the oldest has
+    waited max_wait seconds. Callers are released only after their chunks are
+    written, so nothing is acknowledged that could be lost on a crash.
+    """
+    
+    def __init__(self, manager: VectorStoreManager, max_batch: int, max_wait: float):
+        self.manager = manager
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending = []  # (texts, embeddings, metadatas, ids, future) per caller
+        self._pending_chunks = 0
+        self._lock = asyncio.Lock()
+        self._timer = None
+    
+    async def add(self, texts, embeddings, metadatas, ids):
+        """Buffer chunks with precomputed embeddings and wait until they are written."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((texts, embeddings, metadatas, ids, future))
+        self._pending_chunks += len(texts)
+        
+        if self._pending_chunks >= self.max_batch:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+        
+        await future
+    
+    async def _flush_later(self):
+        """Flush the buffer once the oldest chunk has waited long enough."""
+        await asyncio.sleep(self.max_wait)
+        await self.flush()
+    
+    async def flush(self):
+        """Write every buffered chunk in one upsert."""
+        async with self._lock:
+            if self._timer is not None and self._timer is not asyncio.current_task():
+                self._timer.cancel()
+            self._timer = None
+            
+            pending, self._pending, self._pending_chunks = self._pending, [], 0
+            if not pending:
+                return
+            
+            try:
+                await asyncio.to_thread(
+                    self.manager.add_embeddings,
+                    texts=[text for item in pending for text in item[0]],
+                    embeddings=[vector for item in pending for vector in item[1]],
+                    metadatas=[metadata for item in pending for metadata in item[2]],
+                    ids=[chunk_id for item in pending for chunk_id in item[3]]
+                )
+            except Exception as e:
+                for *_, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for *_, future in pending:
+                    if not future.done():
+                        future.set_result(None)
+
+class VectorStoreQueryBatcher:
+    """
+    Coalesce similarity searches that arrive within max_wait seconds into one query.
+    
+    Searches sharing the same k, filter and min_score are embedded in one batch
+    and sent to Chroma as a single multi-query request.
+    """
+    
+    def __init__(self, manager: VectorStoreManager, max_wait: float):
+        self.manager = manager
+        self.max_wait = max_wait
+        self._pending = []  # (query, k, filter, min_score, future) per caller
+        self._timer = None
+    
+    async def similarity_search_with_score(self, query, k=None, filter=None, min_score=None):
+        """Queue a search and wait for its (document, score) pairs."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((query, k or get_settings().NUM_RESULTS, filter, min_score, future))
+        
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+        
+        return await future
+    
+    async def _flush_later(self):
+        """Run every search queued during the window, one query per (k, filter, min_score)."""
+        await asyncio.sleep(self.max_wait)
+        pending, self._pending, self._timer = self._pending, [], None
+        
+        # Filters are dicts, so group with a linear scan rather than a dict
+        groups = []
+        for item in pending:
+            for key, items in groups:
+                if key == item[1:4]:
+                    items.append(item)
+                    break
+            else:
+                groups.append((item[1:4], [item]))
+        
+        await asyncio.gather(*(self._search(*key, items) for key, items in groups))
+    
+    async def _search(self, k, filter, min_score, items):
+        """Run one batched search and hand each caller its results."""
+        try:
+            results = await asyncio.to_thread(
+                self.manager.batch_similarity_search_with_score,
+                [item[0] for item in items],
+                k=k,
+                filter=filter,
+                min_score=min_score
+            )
+        except Exception as e:
+            for *_, future in items:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (*_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+
+# Singleton instances
+vectorstore_manager = VectorStoreManager()
+_settings = get_settings()
+vectorstore_buffer = VectorStoreBuffer(
+    vectorstore_manager,
+    max_batch=_settings.VECTORSTORE_BATCH_SIZE,
+    max_wait=_settings.VECTORSTORE_FLUSH_SECONDS
+)
+vectorstore_query_batcher = VectorStoreQueryBatcher(
+    vectorstore_manager,
+    max_wait=_settings.RETRIEVAL_BATCH_WINDOW_SECONDS
+)
\ No newline at end of file
@@ -1,12 +1,17 @@
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+from contextlib import asynccontextmanager
+from sqlalchemy import String, literal, text
+import asyncio
 import logging
+import orjson
 import os
 from typing import List, Optional
 from dotenv import load_dotenv
 
-from .database import engine, SessionLocal, Base
+from .database import engine, SessionLocal, Base, warm_connection_pool
+from .cache import init_cache, close_cache
 from .models import models
 from .seed import seed_database
 from .routers import (
@@ -14,6 +19,11 @@ from .routers import (
     updates, jurisdictions, documents, llm, dashboard, training
 )
 from .llm.openai_config import validate_api_key
+from .llm.openai_client import openai_client
+from .llm.ingest_pool import ingest_pool
+from .llm.document_processor import shutdown_pdf_pool
+from .llm.scheduler import batch_scheduler
+from .llm.vectorstore import vectorstore_buffer
 from .regulatory_monitor.monitor import regulatory_monitor
 
 # Load environment variables
@@ -26,20 +36,96 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
-
-# Seed the database
-seed_database()
-
 # Validate OpenAI configuration
 if not validate_api_key():
     logger.warning("OpenAI API key not properly configured. LLM features will be disabled.")
 
+# Key of the PostgreSQL advisory lock that lets one worker at a time create tables and seed
+SCHEMA_LOCK_KEY = 7271645
+
+def convert_enum_names(conn):
+    """
+    Rewrite enum columns still holding member names (e.g. HIGH) to the values (High) EnumString stores.
+    
+    SQLite tables created by older releases stored the names; PostgreSQL is converted by the
+    enum_columns_to_varchar migration. Rows already holding values are left alone, so this is
+    safe to run on every start.
+    """
+    for table in models.Base.metadata.sorted_tables:
+        for column in table.columns:
+            if not isinstance(column.type, models.EnumString):
+                continue
+            for member in column.type.enum_class:
+                if member.name != member.value:
+                    # Bound as a plain string; EnumString would reject the name
+                    legacy_name = literal(member.name, String())
+                    conn.execute(
+                        table.update().where(column == legacy_name).values({column.name: member.value})
+                    )
+
+def prepare_database():
+    """Create the database tables and seed them, one worker at a time on PostgreSQL."""
+    with engine.connect() as conn:
+        locked = conn.dialect.name == "postgresql"
+        if locked:
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+        try:
+            models.Base.metadata.create_all(bind=conn)
+            if conn.dialect.name == "sqlite":
+                convert_enum_names(conn)
+            conn.commit()
+            seed_database()
+        finally:
+            if locked:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SCHEMA_LOCK_KEY})
+                conn.commit()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare the database and start the background services; stop them on shutdown."""
+    await asyncio.to_thread(prepare_database)
+    init_cache()
+    
+    # Under gunicorn only one worker runs the monitor (see gunicorn_conf.py)
+    run_monitor = os.getenv("REGULATORY_MONITOR_ENABLED", "1") == "1"
+    if run_monitor:
+        try:
+            regulatory_monitor.start_monitoring()
+            logger.info("Regulatory monitoring system started")
+        except Exception as e:
+            logger.error(f"Error starting regulatory monitoring: {str(e)}")
+    
+    try:
+        await warm_connection_pool()
+    except Exception as e:
+        logger.error(f"Error warming database connection pool: {str(e)}")
+    
+    ingest_pool.start()
+    batch_scheduler.start()
+    
+    yield
+    
+    if run_monitor:
+        try:
+            regulatory_monitor.stop_monitoring()
+            logger.info("Regulatory monitoring system stopped")
+        except Exception as e:
+            logger.error(f"Error stopping regulatory monitoring: {str(e)}")
+        await regulatory_monitor.close()
+    
+    await ingest_pool.stop()
+    await asyncio.to_thread(shutdown_pdf_pool)
+    await batch_scheduler.stop()
+    await vectorstore_buffer.flush()
+    await openai_client.close()
+    await close_cache()
+
 app = FastAPI(
     title="Regulatory Compliance API",
     description="API for the Regulatory Compliance Platform",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -84,40 +170,26 @@ async def health_check():
     }
 
 # Exception handlers
+# The 500 body never changes, so it is encoded once
+INTERNAL_ERROR_BODY = orjson.dumps({"detail": "Internal server error"})
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
+        headers=getattr(exc, "headers", None),
     )
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     logger.error(f"Unhandled exception: {str(exc)}")
-    return JSONResponse(
+    return Response(
+        content=INTERNAL_ERROR_BODY,
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={"detail": "Internal server error"},
+        media_type="application/json",
     )
 
-# Startup and shutdown events
-@app.on_event("startup")
-async def startup_event():
-    """Start the regulatory monitoring system."""
-    try:
-        regulatory_monitor.start_monitoring()
-        logger.info("Regulatory monitoring system started")
-    except Exception as e:
-        logger.error(f"Error starting regulatory monitoring: {str(e)}")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Stop the regulatory monitoring system."""
-    try:
-        regulatory_monitor.stop_monitoring()
-        logger.info("Regulatory monitoring system stopped")
-    except Exception as e:
-        logger.error(f"Error stopping regulatory monitoring: {str(e)}")
-
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, access_log=False)
\ No newline at end of file
@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table, DateTime, Text, Boolean, Enum, JSON, Date, Numeric
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, DateTime, Text, Boolean, JSON, Date, Numeric, Index, select
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from typing import List
 import uuid
 import enum
 
@@ -104,11 +106,36 @@ related_regulations = Table(
 )
 
 
+def generate_id() -> str:
+    """Primary key default: a random UUID in its 32-character hex form."""
+    return uuid.uuid4().hex
+
+
+class EnumString(TypeDecorator):
+    """
+    A plain VARCHAR column holding an enum's value.
+    
+    Values are checked against the enum when written; rows load back as plain strings
+    with no per-row conversion (the API schemas validate them into the enum).
+    """
+    impl = String(32)
+    cache_ok = True
+
+    def __init__(self, enum_class):
+        super().__init__()
+        self.enum_class = enum_class
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self.enum_class(value).value
+
+
 # Models
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     username = Column(String, unique=True, nullable=False)
     email = Column(String, unique=True, nullable=False)
     hashed_password = Column(String, nullable=False)
@@ -125,10 +152,10 @@ class User(Base):
 class Jurisdiction(Base):
     __tablename__ = "jurisdictions"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     name = Column(String, nullable=False)
-    code = Column(String, nullable=False)
-    type = Column(Enum(JurisdictionType), nullable=False)
+    code = Column(String, nullable=False, index=True)
+    type = Column(EnumString(JurisdictionType), nullable=False)
     parent_id = Column(String, ForeignKey('jurisdictions.id'))
 
     # Relationships
@@ -142,7 +169,7 @@ class Jurisdiction(Base):
 class Agency(Base):
     __tablename__ = "agencies"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     name = Column(String, nullable=False, unique=True)
     description = Column(Text)
     jurisdiction_id = Column(String, ForeignKey('jurisdictions.id'))
@@ -156,7 +183,7 @@ class Agency(Base):
 class Bank(Base):
     __tablename__ = "banks"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     name = Column(String, nullable=False, unique=True)
     jurisdiction_id = Column(String, ForeignKey('jurisdictions.id'))
     size_category = Column(String)
@@ -173,10 +200,10 @@ class Bank(Base):
 class RiskAssessmentUnit(Base):
     __tablename__ = "risk_assessment_units"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     name = Column(String, nullable=False, unique=True)
     description = Column(Text)
-    category = Column(Enum(UnitCategory), nullable=False)
+    category = Column(EnumString(UnitCategory), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -190,12 +217,15 @@ class RiskAssessmentUnit(Base):
 
 class Regulation(Base):
     __tablename__ = "regulations"
+    __table_args__ = (
+        Index("ix_regulation_agency_impact", "agency_id", "impact_level"),
+    )
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     title = Column(String, nullable=False)
     agency_id = Column(String, ForeignKey('agencies.id'), nullable=False)
     jurisdiction_id = Column(String, ForeignKey('jurisdictions.id'))
-    impact_level = Column(Enum(ImpactLevel), nullable=False)
+    impact_level = Column(EnumString(ImpactLevel), nullable=False)
     last_updated = Column(DateTime, nullable=False)
     summary = Column(Text)
     effective_date = Column(DateTime)
@@ -204,7 +234,8 @@ class Regulation(Base):
     official_reference = Column(String)
 
     # Relationships
-    agency = relationship("Agency", back_populates="regulations")
+    # Not part of schemas.Regulation; raise rather than silently issue a query per row
+    agency = relationship("Agency", back_populates="regulations", lazy="raise_on_sql")
     jurisdiction = relationship("Jurisdiction", back_populates="regulations")
     compliance_steps = relationship("ComplianceStep", back_populates="regulation")
     affected_banks = relationship(
@@ -228,13 +259,34 @@ class Regulation(Base):
         backref="related_to"
     )
 
+    @classmethod
+    def related_closure(cls, session, root_ids: List[str]) -> List[str]:
+        """
+        Ids of every regulation reachable from root_ids through related_regulations.
+        
+        Runs as one recursive CTE; UNION drops ids already reached, so cycles terminate.
+        """
+        if not root_ids:
+            return []
+        
+        link = related_regulations
+        reachable = select(link.c.related_regulation_id.label("id")).where(
+            link.c.regulation_id.in_(root_ids)
+        ).cte("reachable", recursive=True)
+        reachable = reachable.union(
+            select(link.c.related_regulation_id).join(
+                reachable, link.c.regulation_id == reachable.c.id
+            )
+        )
+        return session.execute(select(reachable.c.id)).scalars().all()
+
 
 class RegulationCategoryAssociation(Base):
     __tablename__ = "regulation_categories"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     regulation_id = Column(String, ForeignKey('regulations.id'), nullable=False)
-    category = Column(Enum(RegulationCategory), nullable=False)
+    category = Column(EnumString(RegulationCategory), nullable=False)
 
     # Relationships
     regulation = relationship("Regulation", back_populates="categories")
@@ -243,7 +295,7 @@ class RegulationCategoryAssociation(Base):
 class ComplianceStep(Base):
     __tablename__ = "compliance_steps"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     regulation_id = Column(String, ForeignKey('regulations.id'), nullable=False)
     description = Column(Text, nullable=False)
     order = Column(Integer, nullable=False)
@@ -254,12 +306,15 @@ class ComplianceStep(Base):
 
 class ComplianceAlert(Base):
     __tablename__ = "compliance_alerts"
+    __table_args__ = (
+        Index("ix_alerts_reg_due", "regulation_id", "due_date"),
+    )
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     title = Column(String, nullable=False)
     description = Column(Text)
-    due_date = Column(DateTime, nullable=False)
-    priority = Column(Enum(ImpactLevel), nullable=False)
+    due_date = Column(DateTime, nullable=False, index=True)
+    priority = Column(EnumString(ImpactLevel), nullable=False)
     regulation_id = Column(String, ForeignKey('regulations.id'), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -270,7 +325,7 @@ class ComplianceAlert(Base):
 class RegulatoryUpdate(Base):
     __tablename__ = "regulatory_updates"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     title = Column(String, nullable=False)
     date = Column(DateTime, nullable=False)
     agency = Column(String, nullable=False)
@@ -284,7 +339,7 @@ class RegulatoryUpdate(Base):
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     content = Column(Text, nullable=False)
     sender = Column(String, nullable=False)  # 'user' or 'bot'
     timestamp = Column(DateTime, default=datetime.utcnow)
@@ -298,7 +353,7 @@ class ChatMessage(Base):
 class Citation(Base):
     __tablename__ = "citations"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     message_id = Column(String, ForeignKey('chat_messages.id'), nullable=False)
     regulation_id = Column(String, ForeignKey('regulations.id'), nullable=False)
     text = Column(Text, nullable=False)
@@ -311,7 +366,7 @@ class Citation(Base):
 class Document(Base):
     __tablename__ = "documents"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     title = Column(String, nullable=False)
     description = Column(Text)
     file_path = Column(String)
@@ -332,51 +387,38 @@ class Document(Base):
 
 class EmployeeTraining(Base):
     __tablename__ = "employee_trainings"
+    __table_args__ = (
+        Index("ix_training_status_due", "status", "due_date"),
+    )
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     employee_name = Column(String, nullable=False)
     employee_email = Column(String, nullable=False)
     manager_name = Column(String, nullable=False)
     manager_email = Column(String, nullable=False)
     training_name = Column(String, nullable=False)
     due_date = Column(DateTime, nullable=False)
-    status = Column(Enum(TrainingStatus), default=TrainingStatus.PENDING)
+    status = Column(EnumString(TrainingStatus), default=TrainingStatus.PENDING)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     notification_sent = Column(Boolean, default=False)
     notification_sent_at = Column(DateTime)
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "employee_name": self.employee_name,
-            "employee_email": self.employee_email,
-            "manager_name": self.manager_name,
-            "manager_email": self.manager_email,
-            "training_name": self.training_name,
-            "due_date": self.due_date.isoformat() if self.due_date else None,
-            "status": self.status,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "notification_sent": self.notification_sent,
-            "notification_sent_at": self.notification_sent_at.isoformat() if self.notification_sent_at else None
-        }
-
 
 # Entity Analysis Models
 class Entity(Base):
     __tablename__ = "entities"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     name = Column(String, nullable=False)
-    type = Column(Enum(EntityType), nullable=False)
+    type = Column(EnumString(EntityType), nullable=False)
     registration_number = Column(String)
     jurisdiction = Column(String)
     incorporation_date = Column(Date)
     risk_score = Column(Integer)
     confidence_score = Column(Integer)
     last_analyzed_at = Column(DateTime)
-    analysis_status = Column(Enum(VerificationStatus), default=VerificationStatus.PENDING)
+    analysis_status = Column(EnumString(VerificationStatus), default=VerificationStatus.PENDING)
     entity_metadata = Column(JSON, default={})
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -406,14 +448,14 @@ class Entity(Base):
 class EntitySource(Base):
     __tablename__ = "entity_sources"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     entity_id = Column(String, ForeignKey("entities.id", ondelete="CASCADE"))
-    source_type = Column(Enum(SourceType), nullable=False)
+    source_type = Column(EnumString(SourceType), nullable=False)
     source_url = Column(String)
     source_date = Column(DateTime)
     content = Column(Text)
     reliability_score = Column(Integer)
-    verification_status = Column(Enum(VerificationStatus), default=VerificationStatus.PENDING)
+    verification_status = Column(EnumString(VerificationStatus), default=VerificationStatus.PENDING)
     verified_at = Column(DateTime)
     verified_by = Column(String, ForeignKey("users.id"))
     source_metadata = Column(JSON, default={})
@@ -427,7 +469,7 @@ class EntitySource(Base):
 class EntityTransaction(Base):
     __tablename__ = "entity_transactions"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     entity_id = Column(String, ForeignKey("entities.id", ondelete="CASCADE"))
     transaction_date = Column(DateTime, nullable=False)
     transaction_type = Column(String, nullable=False)
@@ -446,7 +488,7 @@ class EntityTransaction(Base):
 class EntityRelationship(Base):
     __tablename__ = "entity_relationships"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     from_entity_id = Column(String, ForeignKey("entities.id", ondelete="CASCADE"))
     to_entity_id = Column(String, ForeignKey("entities.id", ondelete="CASCADE"))
     relationship_type = Column(String, nullable=False)
@@ -463,7 +505,7 @@ class EntityRelationship(Base):
 class EntityRiskFactor(Base):
     __tablename__ = "entity_risk_factors"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     entity_id = Column(String, ForeignKey("entities.id", ondelete="CASCADE"))
     factor_type = Column(String, nullable=False)
     factor_value = Column(String)
@@ -11,39 +11,38 @@ logger = logging.getLogger(__name__)
 class APICollector(UpdateCollector):
     """Collector for API-based updates."""
     
-    async def collect_updates(self) -> List[Dict[str, Any]]:
+    async def collect_updates(self, session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
         """Collect updates from API endpoints."""
         updates = []
         
-        async with aiohttp.ClientSession() as session:
-            for endpoint_name, endpoint_url in self.config.get("api_endpoints", {}).items():
-                try:
-                    # Prepare headers
-                    headers = self._get_headers(endpoint_name)
-                    
-                    # Make API request
-                    async with session.get(endpoint_url, headers=headers) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            
-                            # Process response based on endpoint type
-                            endpoint_updates = await self._process_endpoint_data(
-                                endpoint_name,
-                                data
-                            )
-                            
-                            updates.extend(endpoint_updates)
-                        else:
-                            logger.error(
-                                f"API request failed for {endpoint_url}: "
-                                f"Status {response.status}"
-                            )
+        for endpoint_name, endpoint_url in self.config.get("api_endpoints", {}).items():
+            try:
+                # Prepare headers
+                headers = self._get_headers(endpoint_name)
                 
-                except Exception as e:
-                    logger.error(
-                        f"Error collecting updates from {endpoint_url}: {str(e)}"
-                    )
-                    continue
+                # Make API request
+                async with session.get(endpoint_url, headers=headers) as response:
+                    if response.status == 200:
+                        data = await response.json()
+                        
+                        # Process response based on endpoint type
+                        endpoint_updates = await self._process_endpoint_data(
+                            endpoint_name,
+                            data
+                        )
+                        
+                        updates.extend(endpoint_updates)
+                    else:
+                        logger.error(
+                            f"API request failed for {endpoint_url}: "
+                            f"Status {response.status}"
+                        )
+            
+            except Exception as e:
+                logger.error(
+                    f"Error collecting updates from {endpoint_url}: {str(e)}"
+                )
+                continue
         
         return updates
     
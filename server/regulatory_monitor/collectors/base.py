@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import logging
+import aiohttp
 
 logger = logging.getLogger(__name__)
 
@@ -13,8 +14,8 @@ class UpdateCollector(ABC):
         self.config = config
     
     @abstractmethod
-    async def collect_updates(self) -> List[Dict[str, Any]]:
-        """Collect regulatory updates from the source."""
+    async def collect_updates(self, session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
+        """Collect regulatory updates from the source using the monitor's shared HTTP session."""
         pass
     
     def format_update(
@@ -1,3 +1,4 @@
+import aiohttp
 import feedparser
 from datetime import datetime
 from typing import List, Dict, Any
@@ -11,13 +12,25 @@ logger = logging.getLogger(__name__)
 class RSSCollector(UpdateCollector):
     """Collector for RSS feed updates."""
     
-    async def collect_updates(self) -> List[Dict[str, Any]]:
+    async def collect_updates(self, session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
         """Collect updates from RSS feeds."""
         updates = []
         
         for feed_url in self.config.get("rss_feeds", []):
             try:
-                feed = feedparser.parse(feed_url)
+                # Fetch on the shared session; feedparser would block the event loop on urllib
+                async with session.get(feed_url) as response:
+                    if response.status != 200:
+                        logger.error(f"Failed to fetch RSS feed {feed_url}: Status {response.status}")
+                        continue
+                    body = await response.read()
+                    feed = feedparser.parse(
+                        body,
+                        response_headers={
+                            "content-location": str(response.url),
+                            "content-type": response.headers.get("Content-Type", "")
+                        }
+                    )
                 
                 for entry in feed.entries:
                     try:
@@ -4,7 +4,6 @@ from typing import List, Dict, Any, Optional
 import logging
 from datetime import datetime
 import re
-import ssl
 
 from .base import UpdateCollector
 
@@ -13,37 +12,28 @@ logger = logging.getLogger(__name__)
 class WebCollector(UpdateCollector):
     """Collector for web scraping based updates."""
     
-    async def collect_updates(self) -> List[Dict[str, Any]]:
+    async def collect_updates(self, session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
         """Collect updates by scraping web pages."""
         updates = []
         
-        # Create SSL context that accepts self-signed certificates
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        # Create connection with custom SSL context
-        conn = aiohttp.TCPConnector(ssl=ssl_context)
-        
-        async with aiohttp.ClientSession(connector=conn) as session:
-            for url in self.config.get("web_scraping_urls", []):
-                try:
-                    # Fetch page content with SSL verification disabled
-                    async with session.get(url, ssl=False) as response:
-                        if response.status == 200:
-                            html = await response.text()
-                            
-                            # Parse updates based on agency-specific selectors
-                            page_updates = await self._parse_page(url, html)
-                            updates.extend(page_updates)
-                        else:
-                            logger.error(
-                                f"Failed to fetch {url}: Status {response.status}"
-                            )
-                
-                except Exception as e:
-                    logger.error(f"Error scraping {url}: {str(e)}")
-                    continue
+        for url in self.config.get("web_scraping_urls", []):
+            try:
+                # Fetch page content with SSL verification disabled (accepts self-signed certificates)
+                async with session.get(url, ssl=False) as response:
+                    if response.status == 200:
+                        html = await response.text()
+                        
+                        # Parse updates based on agency-specific selectors
+                        page_updates = await self._parse_page(url, html)
+                        updates.extend(page_updates)
+                    else:
+                        logger.error(
+                            f"Failed to fetch {url}: Status {response.status}"
+                        )
+            
+            except Exception as e:
+                logger.error(f"Error scraping {url}: {str(e)}")
+                continue
         
         return updates
     
@@ -3,6 +3,7 @@ import logging
 import asyncio
 from datetime import datetime
 import json
+import aiohttp
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from .config import settings
@@ -14,12 +15,17 @@ from .alert_manager import alert_manager
 
 logger = logging.getLogger(__name__)
 
+# Limits for the HTTP session shared by all collectors
+MAX_CONNECTIONS = 100
+REQUEST_TIMEOUT_SECONDS = 60
+
 class RegulatoryMonitor:
     """Monitor for collecting regulatory updates from various agencies."""
     
     def __init__(self):
         self.collectors: Dict[str, List[UpdateCollector]] = {}
         self.scheduler = AsyncIOScheduler()
+        self.session: Optional[aiohttp.ClientSession] = None
         self._initialize_collectors()
     
     def _initialize_collectors(self):
@@ -45,9 +51,25 @@ class RegulatoryMonitor:
                     WebCollector(agency_id, config.dict())
                 )
     
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the HTTP session shared by every collector, creating it on first use."""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS)
+            )
+        return self.session
+    
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+    
     async def collect_updates(self) -> List[Dict[str, Any]]:
         """Collect updates from all agencies."""
         all_updates = []
+        session = self._get_session()
         
         for agency_id, collectors in self.collectors.items():
             try:
@@ -56,7 +78,7 @@ class RegulatoryMonitor:
                 # Collect updates from each collector for this agency
                 for collector in collectors:
                     try:
-                        updates = await collector.collect_updates()
+                        updates = await collector.collect_updates(session)
                         
                         # Add collector type to updates
                         for update in updates:
@@ -1,31 +1,36 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi_cache.decorator import cache
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from ..database import get_db
+from ..database import get_async_db
 from ..models import models
 from ..schemas import schemas
+from ..cache import invalidate
 from ..dependencies import get_current_user, get_admin_user
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Agency])
+@cache(namespace="agencies")
 async def get_agencies(
     skip: int = 0, 
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: schemas.User = Depends(get_current_user)
 ):
-    agencies = db.query(models.Agency).offset(skip).limit(limit).all()
-    return agencies
+    agencies = (await db.execute(select(models.Agency).offset(skip).limit(limit))).scalars().all()
+    # Schema instances rather than ORM rows, so the cache can encode them
+    return [schemas.Agency.model_validate(agency) for agency in agencies]
 
 @router.get("/{agency_id}", response_model=schemas.Agency)
 async def get_agency(
     agency_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: schemas.User = Depends(get_current_user)
 ):
-    agency = db.query(models.Agency).filter(models.Agency.id == agency_id).first()
+    agency = await db.get(models.Agency, agency_id)
     if agency is None:
         raise HTTPException(status_code=404, detail="Agency not found")
     return agency
@@ -33,7 +38,7 @@ async def get_agency(
 @router.post("/", response_model=schemas.Agency)
 async def create_agency(
     agency: schemas.AgencyCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: schemas.User = Depends(get_admin_user)
 ):
     db_agency = models.Agency(
@@ -41,46 +46,51 @@ async def create_agency(
         description=agency.description
     )
     db.add(db_agency)
-    db.commit()
-    db.refresh(db_agency)
+    await db.commit()
+    await db.refresh(db_agency)
+    await invalidate("agencies")
     return db_agency
 
 @router.put("/{agency_id}", response_model=schemas.Agency)
 async def update_agency(
     agency_id: str,
     agency: schemas.AgencyCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: schemas.User = Depends(get_admin_user)
 ):
-    db_agency = db.query(models.Agency).filter(models.Agency.id == agency_id).first()
+    db_agency = await db.get(models.Agency, agency_id)
     if db_agency is None:
         raise HTTPException(status_code=404, detail="Agency not found")
     
     db_agency.name = agency.name
     db_agency.description = agency.description
     
-    db.commit()
-    db.refresh(db_agency)
+    await db.commit()
+    await db.refresh(db_agency)
+    await invalidate("agencies")
     return db_agency
 
 @router.delete("/{agency_id}")
 async def delete_agency(
     agency_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: schemas.User = Depends(get_admin_user)
 ):
-    db_agency = db.query(models.Agency).filter(models.Agency.id == agency_id).first()
+    db_agency = await db.get(models.Agency, agency_id)
     if db_agency is None:
         raise HTTPException(status_code=404, detail="Agency not found")
     
     # Check if agency has regulations
-    regulations = db.query(models.Regulation).filter(models.Regulation.agency_id == agency_id).all()
-    if regulations:
+    regulation_id = await db.scalar(
+        select(models.Regulation.id).where(models.Regulation.agency_id == agency_id).limit(1)
+    )
+    if regulation_id is not None:
         raise HTTPException(
             status_code=400, 
             detail="Cannot delete agency with associated regulations. Remove regulations first."
         )
     
-    db.delete(db_agency)
-    db.commit()
+    await db.delete(db_agency)
+    await db.commit()
+    await invalidate("agencies")
     return {"message": "Agency deleted successfully"}
\ No newline at end of file
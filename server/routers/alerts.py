@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 from ..database import get_db
 from ..models import models
 from ..schemas import schemas
+from ..cache import invalidate
 from ..dependencies import get_current_user, get_admin_user
 
 router = APIRouter()
@@ -89,6 +90,7 @@ async def create_alert(
     db.add(db_alert)
     db.commit()
     db.refresh(db_alert)
+    await invalidate("regulations")
     return db_alert
 
 @router.put("/{alert_id}", response_model=schemas.ComplianceAlert)
@@ -115,6 +117,7 @@ async def update_alert(
     
     db.commit()
     db.refresh(db_alert)
+    await invalidate("regulations")
     return db_alert
 
 @router.delete("/{alert_id}")
@@ -129,4 +132,5 @@ async def delete_alert(
     
     db.delete(db_alert)
     db.commit()
+    await invalidate("regulations")
     return {"message": "Alert deleted successfully"}
\ No newline at end of file
@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
+import json
 import logging
+import time
 from datetime import datetime
 
-from ..database import get_db
+from ..database import get_db, SessionLocal
 from ..models import models
 from ..schemas import schemas
 from ..dependencies import get_current_user
@@ -13,6 +16,35 @@ from ..llm.rag import rag_engine
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# A streamed frame is sent once it holds this many tokens or this much time has passed
+SSE_FRAME_TOKENS = 16
+SSE_FRAME_SECONDS = 0.03
+
+def _save_citations(db: Session, message_id, sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Store a citation for each source that belongs to a regulation and return them."""
+    db_citations = []
+    for source in sources:
+        if 'document_id' in source:
+            # Find the regulation associated with this document
+            document = db.query(models.Document).filter(models.Document.id == source.get('document_id').split('-chunk-')[0]).first()
+            
+            if document and document.regulation_id:
+                citation_text = f"Source: {source.get('title', 'Document')}"
+                
+                db_citation = models.Citation(
+                    message_id=message_id,
+                    regulation_id=document.regulation_id,
+                    text=citation_text
+                )
+                db.add(db_citation)
+                db_citations.append({
+                    "regulation_id": document.regulation_id,
+                    "text": citation_text
+                })
+    
+    db.commit()
+    return db_citations
+
 @router.post("/query", response_model=schemas.AssistantResponse)
 async def query_assistant(
     query: schemas.AssistantQuery,
@@ -35,7 +67,7 @@ async def query_assistant(
     
     try:
         # Generate response using RAG
-        response, sources = rag_engine.answer_question(query.query)
+        response, sources = await rag_engine.answer_question(query.query)
         
         # Save bot message to database
         bot_message = models.ChatMessage(
@@ -48,27 +80,7 @@ async def query_assistant(
         db.refresh(bot_message)
         
         # Save citations
-        db_citations = []
-        for source in sources:
-            if 'document_id' in source:
-                # Find the regulation associated with this document
-                document = db.query(models.Document).filter(models.Document.id == source.get('document_id').split('-chunk-')[0]).first()
-                
-                if document and document.regulation_id:
-                    citation_text = f"Source: {source.get('title', 'Document')}"
-                    
-                    db_citation = models.Citation(
-                        message_id=bot_message.id,
-                        regulation_id=document.regulation_id,
-                        text=citation_text
-                    )
-                    db.add(db_citation)
-                    db_citations.append({
-                        "regulation_id": document.regulation_id,
-                        "text": citation_text
-                    })
-        
-        db.commit()
+        db_citations = _save_citations(db, bot_message.id, sources)
         
         return {
             "response": response,
@@ -94,6 +106,59 @@ async def query_assistant(
             "citations": []
         }
 
+@router.post("/query/stream")
+async def stream_assistant(
+    query: schemas.AssistantQuery,
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_user)
+):
+    """Answer a query as server-sent events: batches of tokens, then the citations."""
+    logger.info(f"User {query.user_id} asked (streaming): {query.query}")
+    
+    # Save user message to database
+    user_message = models.ChatMessage(
+        content=query.query,
+        sender="user",
+        user_id=query.user_id
+    )
+    db.add(user_message)
+    db.commit()
+    
+    tokens, sources = await rag_engine.answer_question(query.query, stream=True)
+    
+    def event_stream():
+        # Runs in the threadpool after the request's session is closed
+        parts = []
+        frame_start, last_sent = 0, time.monotonic()
+        for token in tokens:
+            parts.append(token)
+            # Send tokens in small frames rather than one event each
+            if len(parts) - frame_start >= SSE_FRAME_TOKENS or time.monotonic() - last_sent >= SSE_FRAME_SECONDS:
+                yield f"data: {json.dumps({'token': ''.join(parts[frame_start:])})}\n\n"
+                frame_start, last_sent = len(parts), time.monotonic()
+        if frame_start < len(parts):
+            yield f"data: {json.dumps({'token': ''.join(parts[frame_start:])})}\n\n"
+        
+        stream_db = SessionLocal()
+        try:
+            bot_message = models.ChatMessage(
+                content="".join(parts),
+                sender="bot",
+                user_id=query.user_id
+            )
+            stream_db.add(bot_message)
+            stream_db.commit()
+            citations = _save_citations(stream_db, bot_message.id, sources)
+        except Exception as e:
+            logger.error(f"Error saving streamed response: {str(e)}")
+            citations = []
+        finally:
+            stream_db.close()
+        
+        yield f"event: done\ndata: {json.dumps({'citations': citations})}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 @router.get("/history/{user_id}", response_model=List[schemas.ChatMessage])
 async def get_chat_history(
     user_id: str,
@@ -5,6 +5,7 @@ from typing import List
 from ..database import get_db
 from ..models import models
 from ..schemas import schemas
+from ..cache import invalidate
 from ..dependencies import get_current_user, get_admin_user
 
 router = APIRouter()
@@ -42,6 +43,7 @@ async def create_bank(
     db.add(db_bank)
     db.commit()
     db.refresh(db_bank)
+    await invalidate("regulations")
     return db_bank
 
 @router.put("/{bank_id}", response_model=schemas.Bank)
@@ -59,6 +61,7 @@ async def update_bank(
     
     db.commit()
     db.refresh(db_bank)
+    await invalidate("regulations")
     return db_bank
 
 @router.delete("/{bank_id}")
@@ -73,6 +76,7 @@ async def delete_bank(
     
     db.delete(db_bank)
     db.commit()
+    await invalidate("regulations")
     return {"message": "Bank deleted successfully"}
 
 @router.get("/{bank_id}/regulations", response_model=List[schemas.Regulation])
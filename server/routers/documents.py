@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, s
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+import logging
 import os
 import shutil
 import uuid
@@ -11,9 +12,12 @@ from ..models import models
 from ..schemas import schemas
 from ..dependencies import get_current_user, get_admin_user
 from ..llm.document_processor import document_processor
+from ..llm.ingest_pool import ingest_pool
 from ..llm.database_updater import DatabaseUpdater
+from ..cache import invalidate
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # Create upload directory if it doesn't exist
 UPLOAD_DIR = "uploads/documents"
@@ -36,7 +40,7 @@ async def process_document_task(
         # Get document
         document = db.query(models.Document).filter(models.Document.id == document_id).first()
         if not document:
-            print(f"Document {document_id} not found")
+            logger.error(f"Document {document_id} not found")
             return
         
         # Prepare metadata
@@ -50,7 +54,7 @@ async def process_document_task(
         }
         
         # Process document and get LLM response
-        success, llm_response = await document_processor.process_document(
+        success, llm_response = await ingest_pool.enqueue(
             document_id=document_id,
             file_path=file_path,
             url=url,
@@ -64,11 +68,12 @@ async def process_document_task(
                 update_results = updater.update_from_llm_response(llm_response)
                 
                 if not update_results["success"]:
-                    print(f"Error updating database from LLM response: {update_results['errors']}")
+                    logger.error(f"Error updating database from LLM response: {update_results['errors']}")
                 else:
-                    print(f"Successfully updated database from LLM response: {update_results['updates']}")
+                    logger.debug("Successfully updated database from LLM response: %s", update_results["updates"])
+                    await invalidate("regulations", "agencies", "jurisdictions")
             except Exception as e:
-                print(f"Error processing LLM response: {str(e)}")
+                logger.error(f"Error processing LLM response: {str(e)}")
         
         # Update document status
         document.processed = success
@@ -76,10 +81,10 @@ async def process_document_task(
         
         db.commit()
         
-        print(f"Document {document_id} processed successfully: {success}")
+        logger.info(f"Document {document_id} processed successfully: {success}")
         
     except Exception as e:
-        print(f"Error processing document {document_id}: {str(e)}")
+        logger.error(f"Error processing document {document_id}: {str(e)}")
         if db:
             db.rollback()
     finally:
@@ -1,15 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi_cache.decorator import cache
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from ..database import get_db
 from ..models import models
 from ..schemas import schemas
+from ..cache import invalidate
 from ..dependencies import get_current_user, get_admin_user
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Jurisdiction])
+@cache(namespace="jurisdictions")
 async def get_jurisdictions(
     skip: int = 0, 
     limit: int = 100,
@@ -30,7 +33,8 @@ async def get_jurisdictions(
         query = query.filter(models.Jurisdiction.parent_id == None)
     
     jurisdictions = query.offset(skip).limit(limit).all()
-    return jurisdictions
+    # Schema instances rather than ORM rows, so the cache can encode them
+    return [schemas.Jurisdiction.model_validate(jurisdiction) for jurisdiction in jurisdictions]
 
 @router.get("/{jurisdiction_id}", response_model=schemas.Jurisdiction)
 async def get_jurisdiction(
@@ -64,6 +68,7 @@ async def create_jurisdiction(
     db.add(db_jurisdiction)
     db.commit()
     db.refresh(db_jurisdiction)
+    await invalidate("jurisdictions", "regulations")
     return db_jurisdiction
 
 @router.put("/{jurisdiction_id}", response_model=schemas.Jurisdiction)
@@ -94,6 +99,7 @@ async def update_jurisdiction(
     
     db.commit()
     db.refresh(db_jurisdiction)
+    await invalidate("jurisdictions", "regulations")
     return db_jurisdiction
 
 @router.delete("/{jurisdiction_id}")
@@ -124,6 +130,7 @@ async def delete_jurisdiction(
     
     db.delete(db_jurisdiction)
     db.commit()
+    await invalidate("jurisdictions", "regulations")
     return {"message": "Jurisdiction deleted successfully"}
 
 @router.get("/{jurisdiction_id}/regulations", response_model=List[schemas.Regulation])
@@ -5,6 +5,7 @@ from typing import Dict, Any
 from ..database import get_db
 from ..dependencies import get_admin_user
 from ..llm.database_updater import DatabaseUpdater
+from ..cache import invalidate
 
 router = APIRouter()
 
@@ -36,6 +37,7 @@ async def update_database_from_llm(
                 }
             )
         
+        await invalidate("regulations", "agencies", "jurisdictions")
         return results
         
     except Exception as e:
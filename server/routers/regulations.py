@@ -1,16 +1,54 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi_cache.decorator import cache
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List, Optional
 from datetime import datetime
 
 from ..database import get_db
 from ..models import models
 from ..schemas import schemas
+from ..cache import invalidate
 from ..dependencies import get_current_user, get_admin_user
 
 router = APIRouter()
 
+# Collections serialized by schemas.Regulation. Each is fetched with one SELECT ... IN
+# query instead of joining them all, which multiplies the result rows per collection.
+REGULATION_COLLECTIONS = (
+    models.Regulation.categories,
+    models.Regulation.compliance_steps,
+    models.Regulation.affected_banks,
+    models.Regulation.updates,
+    models.Regulation.alerts,
+    models.Regulation.responsible_units,
+)
+
+REGULATION_LOAD_OPTIONS = (
+    joinedload(models.Regulation.jurisdiction),
+    *(selectinload(collection) for collection in REGULATION_COLLECTIONS),
+    selectinload(models.Regulation.related_regulations),
+)
+
+def load_related_regulations(db: Session, regulations: List[models.Regulation]):
+    """
+    Load every regulation the response nests under related_regulations, at any depth.
+    
+    The schema recurses through related_regulations, which would otherwise lazy load
+    each hop; the closure is found with one recursive query and hydrated in one pass.
+    """
+    loaded = {regulation.id for regulation in regulations}
+    missing = [
+        regulation_id
+        for regulation_id in models.Regulation.related_closure(db, list(loaded))
+        if regulation_id not in loaded
+    ]
+    if missing:
+        db.query(models.Regulation).options(*REGULATION_LOAD_OPTIONS).filter(
+            models.Regulation.id.in_(missing)
+        ).all()
+
 @router.get("/", response_model=List[schemas.Regulation])
+@cache(namespace="regulations")
 async def get_regulations(
     skip: int = 0, 
     limit: int = 100,
@@ -42,21 +80,13 @@ async def get_regulations(
             (models.Regulation.summary.ilike(search_term))
         )
     
-    # Eager load all relationships
-    query = query.options(
-        joinedload(models.Regulation.agency),
-        joinedload(models.Regulation.jurisdiction),
-        joinedload(models.Regulation.compliance_steps),
-        joinedload(models.Regulation.affected_banks),
-        joinedload(models.Regulation.updates),
-        joinedload(models.Regulation.alerts),
-        joinedload(models.Regulation.responsible_units),
-        joinedload(models.Regulation.categories),
-        joinedload(models.Regulation.related_regulations)
-    )
+    # Eager load the relationships the response schema reads
+    query = query.options(*REGULATION_LOAD_OPTIONS)
     
     regulations = query.offset(skip).limit(limit).all()
-    return regulations
+    load_related_regulations(db, regulations)
+    # Schema instances rather than ORM rows, so the cache can encode them
+    return [schemas.Regulation.model_validate(regulation) for regulation in regulations]
 
 @router.get("/{regulation_id}", response_model=schemas.Regulation)
 async def get_regulation(
@@ -64,21 +94,13 @@ async def get_regulation(
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_user)
 ):
-    # Query with eager loading of all relationships
-    regulation = db.query(models.Regulation).options(
-        joinedload(models.Regulation.agency),
-        joinedload(models.Regulation.jurisdiction),
-        joinedload(models.Regulation.compliance_steps),
-        joinedload(models.Regulation.affected_banks),
-        joinedload(models.Regulation.updates),
-        joinedload(models.Regulation.alerts),
-        joinedload(models.Regulation.responsible_units),
-        joinedload(models.Regulation.categories),
-        joinedload(models.Regulation.related_regulations)
-    ).filter(models.Regulation.id == regulation_id).first()
+    # Query with eager loading of the relationships the response schema reads
+    regulation = db.query(models.Regulation).options(*REGULATION_LOAD_OPTIONS).filter(models.Regulation.id == regulation_id).first()
     
     if regulation is None:
         raise HTTPException(status_code=404, detail="Regulation not found")
+    
+    load_related_regulations(db, [regulation])
     return regulation
 
 @router.post("/", response_model=schemas.Regulation)
@@ -135,6 +157,7 @@ async def create_regulation(
     
     db.commit()
     db.refresh(db_regulation)
+    await invalidate("regulations")
     return db_regulation
 
 @router.put("/{regulation_id}", response_model=schemas.Regulation)
@@ -192,6 +215,7 @@ async def update_regulation(
     
     db.commit()
     db.refresh(db_regulation)
+    await invalidate("regulations")
     return db_regulation
 
 @router.delete("/{regulation_id}")
@@ -206,6 +230,7 @@ async def delete_regulation(
     
     db.delete(db_regulation)
     db.commit()
+    await invalidate("regulations")
     return {"message": "Regulation deleted successfully"}
 
 @router.get("/search/natural", response_model=List[schemas.Regulation])
@@ -221,23 +246,17 @@ async def natural_language_search(
     search_terms = query.lower().split()
     results = []
     
-    # Query with eager loading
-    regulations = db.query(models.Regulation).options(
-        joinedload(models.Regulation.agency),
-        joinedload(models.Regulation.jurisdiction),
-        joinedload(models.Regulation.compliance_steps),
-        joinedload(models.Regulation.affected_banks),
-        joinedload(models.Regulation.updates),
-        joinedload(models.Regulation.alerts),
-        joinedload(models.Regulation.responsible_units),
-        joinedload(models.Regulation.categories),
-        joinedload(models.Regulation.related_regulations)
+    # Score on the searched columns only; relationships are loaded for the top results below
+    regulations = db.query(
+        models.Regulation.id,
+        models.Regulation.title,
+        models.Regulation.summary
     ).all()
     
     for regulation in regulations:
         score = 0
         title_lower = regulation.title.lower()
-        summary_lower = regulation.summary.lower()
+        summary_lower = (regulation.summary or "").lower()
         
         for term in search_terms:
             if term in title_lower:
@@ -250,4 +269,13 @@ async def natural_language_search(
     
     # Sort by score and return top results
     results.sort(key=lambda x: x[1], reverse=True)
-    return [r[0] for r in results[:10]]
\ No newline at end of file
+    top_ids = [r[0].id for r in results[:10]]
+    if not top_ids:
+        return []
+    
+    loaded = db.query(models.Regulation).options(*REGULATION_LOAD_OPTIONS).filter(
+        models.Regulation.id.in_(top_ids)
+    ).all()
+    load_related_regulations(db, loaded)
+    by_id = {regulation.id: regulation for regulation in loaded}
+    return [by_id[regulation_id] for regulation_id in top_ids if regulation_id in by_id]
\ No newline at end of file
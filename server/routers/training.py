@@ -10,6 +10,7 @@ from jinja2 import Template
 
 from ..database import get_db
 from ..models.models import EmployeeTraining, TrainingStatus
+from ..schemas import schemas
 from ..dependencies import get_current_user, get_admin_user
 
 router = APIRouter()
@@ -143,7 +144,7 @@ async def send_training_notifications(
             detail=f"Error processing training notifications: {str(e)}"
         )
 
-@router.get("/trainings")
+@router.get("/trainings", response_model=schemas.EmployeeTrainingList)
 async def get_trainings(
     skip: int = 0,
     limit: int = 100,
@@ -162,10 +163,10 @@ async def get_trainings(
     
     return {
         "total": total,
-        "trainings": [training.to_dict() for training in trainings]
+        "trainings": trainings
     }
 
-@router.put("/trainings/{training_id}/status")
+@router.put("/trainings/{training_id}/status", response_model=schemas.EmployeeTraining)
 async def update_training_status(
     training_id: str,
     status: TrainingStatus,
@@ -182,4 +183,4 @@ async def update_training_status(
     
     db.commit()
     
-    return training.to_dict()
\ No newline at end of file
+    return training
\ No newline at end of file
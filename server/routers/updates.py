@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 from ..database import get_db
 from ..models import models
 from ..schemas import schemas
+from ..cache import invalidate
 from ..dependencies import get_current_user, get_admin_user
 
 router = APIRouter()
@@ -87,6 +88,7 @@ async def create_update(
     
     db.commit()
     db.refresh(db_update)
+    await invalidate("regulations")
     return db_update
 
 @router.put("/{update_id}", response_model=schemas.RegulatoryUpdate)
@@ -113,6 +115,7 @@ async def update_regulatory_update(
     
     db.commit()
     db.refresh(db_update)
+    await invalidate("regulations")
     return db_update
 
 @router.delete("/{update_id}")
@@ -127,4 +130,5 @@ async def delete_update(
     
     db.delete(db_update)
     db.commit()
+    await invalidate("regulations")
     return {"message": "Update deleted successfully"}
\ No newline at end of file
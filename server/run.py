@@ -24,5 +24,6 @@ if __name__ == "__main__":
         "server.main:app",
         host="0.0.0.0",
         port=port,
-        reload=True
+        reload=True,
+        access_log=False
     )
\ No newline at end of file
@@ -63,6 +63,11 @@ class VerificationStatus(str, Enum):
     DISPUTED = "Disputed"
     INCONCLUSIVE = "Inconclusive"
 
+class TrainingStatus(str, Enum):
+    PENDING = "Pending"
+    IN_PROGRESS = "In Progress"
+    COMPLETED = "Completed"
+
 # Base schemas
 class UserBase(BaseModel):
     username: str
@@ -410,4 +415,26 @@ class EntityRiskFactor(EntityRiskFactorBase):
 class EntitySearchResult(BaseModel):
     entity: Entity
     matched_source: Optional[EntitySource] = None
-    relevance_score: float
\ No newline at end of file
+    relevance_score: float
+
+# Training schemas
+class EmployeeTraining(BaseModel):
+    id: str
+    employee_name: str
+    employee_email: str
+    manager_name: str
+    manager_email: str
+    training_name: str
+    due_date: datetime
+    status: Optional[TrainingStatus] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    notification_sent: Optional[bool] = None
+    notification_sent_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class EmployeeTrainingList(BaseModel):
+    total: int
+    trainings: List[EmployeeTraining]
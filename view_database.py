@@ -33,9 +33,10 @@ def view_table_data(db_path, table_name=None):
             print(f"TABLE: {table}")
             print(f"{'=' * 80}")
             
-            # Get column names
-            cursor.execute(f"PRAGMA table_info({table})")
-            columns = [col[1] for col in cursor.fetchall()]
+            # Get column names; the parameterized statement text is identical
+            # for every table, so SQLite reuses the compiled statement
+            cursor.execute("SELECT name FROM pragma_table_info(?)", (table,))
+            columns = [col[0] for col in cursor.fetchall()]
             
             # Get all rows
             cursor.execute(f"SELECT * FROM {table}")